@@ -140,8 +140,7 @@ if page == "Pipeline Control":
                         )
                         
                         # Mark videos as discovered in DB (but don't dispatch downloads yet)
-                        for video in house_videos:
-                            state_service.mark_video_discovered(video)
+                        state_service.mark_videos_discovered(house_videos)
                         
                         # Store in session state for review
                         st.session_state.discovered_videos = house_videos
@@ -171,8 +170,7 @@ if page == "Pipeline Control":
                         )
                         
                         # Mark videos as discovered in DB (but don't dispatch downloads yet)
-                        for video in senate_videos:
-                            state_service.mark_video_discovered(video)
+                        state_service.mark_videos_discovered(senate_videos)
                         
                         # Store in session state for review
                         st.session_state.discovered_videos = senate_videos
@@ -206,8 +204,7 @@ if page == "Pipeline Control":
                         senate_videos = [v for v in all_videos if v.source == "senate"]
                         
                         # Mark videos as discovered in DB (but don't dispatch downloads yet)
-                        for video in all_videos:
-                            state_service.mark_video_discovered(video)
+                        state_service.mark_videos_discovered(all_videos)
                         
                         # Store in session state for review
                         st.session_state.discovered_videos = all_videos
@@ -1,15 +1,20 @@
 """Database manager for PostgreSQL and SQLite"""
 
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from sqlalchemy import create_engine, Column, String, DateTime, Text, ForeignKey, JSON, func
+from sqlalchemy import create_engine, update, Column, String, DateTime, Text, ForeignKey, JSON, func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session, relationship
 from datetime import datetime
-from typing import Optional, List
+from typing import Iterator, Optional, List
 
 Base = declarative_base()
 
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING ... RETURNING
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
 
 class VideoRecord(Base):
     """Database model for video records"""
@@ -25,10 +30,10 @@ class VideoRecord(Base):
     title = Column(String, nullable=True)
     date_discovered = Column(DateTime, nullable=False, default=datetime.utcnow)
     
-    # Statuses
-    download_status = Column(String, default="pending")
+    # Statuses (indexed for the failed/pending scans)
+    download_status = Column(String, default="pending", index=True)
     audio_status = Column(String, default="pending")
-    transcription_status = Column(String, default="pending")
+    transcription_status = Column(String, default="pending", index=True)
     
     # Paths
     download_path = Column(Text, nullable=True)
@@ -68,20 +73,39 @@ class DatabaseManager:
             db_path.parent.mkdir(parents=True, exist_ok=True)
             db_url = f"sqlite:///{db_path}"
         
-        # Create engine
-        # For Postgres, we might want to add pool_size etc.
-        self.engine = create_engine(db_url, echo=False)
+        # Create engine; connections are pinged before reuse and recycled so long-lived
+        # worker processes don't hand out connections the server already dropped
+        engine_options = {"pool_pre_ping": True, "pool_recycle": 300}
+        if not db_url.startswith("sqlite"):
+            engine_options["pool_size"] = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.engine = create_engine(db_url, echo=False, **engine_options)
         
         # Create session factory
         self.SessionLocal = sessionmaker(bind=self.engine)
         
         # Create tables
         Base.metadata.create_all(self.engine)
+        # create_all skips existing tables, so add indexes introduced after they were created
+        for index in VideoRecord.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
     
     def get_session(self) -> Session:
         """Get a database session"""
         return self.SessionLocal()
     
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Session that commits on success, rolls back on error and is always closed"""
+        session = self.get_session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
     def create_video_record(
         self,
         video_id: str,
@@ -117,6 +141,74 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def create_video_records(self, rows: List[dict]) -> List[str]:
+        """
+        Insert many video records in one transaction, skipping ids that already exist
+        
+        Rows use VideoMetadata.to_dict() keys. For rows that already exist, a non-empty
+        stream_url is written to the stored record instead.
+        
+        Returns:
+            IDs of the records that were inserted
+        """
+        session = self.get_session()
+        try:
+            ids = [row["id"] for row in rows]
+            existing = set()
+            # Chunked to stay under SQLite's bound-parameter limit
+            for i in range(0, len(ids), 500):
+                existing.update(
+                    record_id for (record_id,) in
+                    session.query(VideoRecord.id).filter(VideoRecord.id.in_(ids[i:i + 500]))
+                )
+            
+            now = datetime.utcnow()
+            new_rows = []
+            stream_updates = []
+            for row in rows:
+                if row["id"] in existing:
+                    if row.get("stream_url"):
+                        stream_updates.append({"id": row["id"], "stream_url": row["stream_url"]})
+                    continue
+                existing.add(row["id"])
+                new_rows.append({
+                    "id": row["id"],
+                    "source": row["source"],
+                    "filename": row["filename"],
+                    "url": row["url"],
+                    "stream_url": row.get("stream_url"),
+                    "date_recorded": row["date_recorded"],
+                    "committee": row.get("committee"),
+                    "title": row.get("title"),
+                    "date_discovered": now,
+                })
+            
+            insert = _CONFLICT_INSERTS.get(self.engine.dialect.name)
+            if insert is None:
+                session.add_all([VideoRecord(**row) for row in new_rows])
+                inserted_ids = [row["id"] for row in new_rows]
+            else:
+                # A concurrent discovery (beat vs dashboard) may insert the same ids between
+                # the read above and this insert; skip those rows instead of failing the batch
+                inserted_ids = []
+                for i in range(0, len(new_rows), 100):
+                    stmt = (
+                        insert(VideoRecord)
+                        .values(new_rows[i:i + 100])
+                        .on_conflict_do_nothing(index_elements=["id"])
+                        .returning(VideoRecord.id)
+                    )
+                    inserted_ids.extend(session.scalars(stmt))
+            if stream_updates:
+                session.bulk_update_mappings(VideoRecord, stream_updates)
+            session.commit()
+            return inserted_ids
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
     def update_video_status(
         self,
         video_id: str,
@@ -128,18 +220,25 @@ class DatabaseManager:
         audio_path: Optional[str] = None,
     ):
         """Update various statuses and paths for a video"""
-        session = self.get_session()
-        try:
-            record = session.query(VideoRecord).filter_by(id=video_id, source=source).first()
-            if record:
-                if download_status: record.download_status = download_status
-                if audio_status: record.audio_status = audio_status
-                if transcription_status: record.transcription_status = transcription_status
-                if download_path: record.download_path = download_path
-                if audio_path: record.audio_path = audio_path
-                session.commit()
-        finally:
-            session.close()
+        values = {
+            "download_status": download_status,
+            "audio_status": audio_status,
+            "transcription_status": transcription_status,
+            "download_path": download_path,
+            "audio_path": audio_path,
+        }
+        values = {column: value for column, value in values.items() if value}
+        if not values:
+            return
+        # A single UPDATE rather than SELECT-then-flush; the compiled statement is
+        # reused from the engine's query cache for each combination of columns
+        stmt = (
+            update(VideoRecord)
+            .where(VideoRecord.id == video_id, VideoRecord.source == source)
+            .values(**values)
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt)
 
     def add_transcript(
         self,
@@ -226,6 +325,30 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def iter_videos(
+        self,
+        cutoff_date: Optional[datetime] = None,
+        download_status: Optional[str] = None,
+        source: Optional[str] = None,
+        newest_first: bool = False,
+        batch_size: int = 500,
+    ) -> Iterator[VideoRecord]:
+        """Stream video records in batches (the session stays open until iteration finishes)"""
+        session = self.get_session()
+        try:
+            query = session.query(VideoRecord)
+            if download_status:
+                query = query.filter_by(download_status=download_status)
+            if cutoff_date:
+                query = query.filter(VideoRecord.date_recorded >= cutoff_date)
+            if source:
+                query = query.filter_by(source=source.lower())
+            if newest_first:
+                query = query.order_by(VideoRecord.date_recorded.desc())
+            yield from query.yield_per(batch_size)
+        finally:
+            session.close()
+
     def search_transcripts(self, query: str) -> List[dict]:
         """Search across all transcript records"""
         session = self.get_session()
@@ -1,26 +1,44 @@
 """Blob URL handler for extracting direct video URLs"""
 
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
+import requests
+
+from ..scrapers.house_scraper import DIRECT_VIDEO_BASE_URL as HOUSE_DIRECT_VIDEO_BASE_URL
 from ..utils import get_logger
 
 logger = get_logger(__name__)
 
+# Stream manifest requests (HLS/DASH) awaited while a player page boots
+_MANIFEST_RE = re.compile(r"\.(m3u8|mpd)(\?|$)")
+MANIFEST_WAIT_MS = 10000
+
+# Page assets the player does not need to emit its manifest (images, fonts, CSS)
+_BLOCKED_ASSET_RE = re.compile(r"\.(png|jpe?g|gif|webp|svg|ico|woff2?|ttf|otf|eot|css)(\?|$)", re.IGNORECASE)
+
 
 class BlobHandler:
     """Handles blob URLs and extracts direct video URLs"""
     
-    def __init__(self, use_browser: bool = False):
+    def __init__(self, use_browser: bool = False, session: Optional[requests.Session] = None):
         """
         Initialize blob handler
         
         Args:
             use_browser: Whether to use browser automation (playwright/selenium)
                         for extracting blob URLs. Set to True if videos use blob URLs.
+            session: HTTP session for direct-URL probes (shared connection pool)
         """
         self.use_browser = use_browser
+        self._session = session or requests.Session()
+        self._playwright = None
         self._browser = None
+        # Sync Playwright objects are bound to the thread that created them, so all
+        # browser work runs on this single thread (callers may be download threads)
+        self._browser_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
     
     def is_blob_url(self, url: str) -> bool:
         """Check if URL is a blob URL"""
@@ -39,8 +57,12 @@ class BlobHandler:
         # Check if it's a player page that might need browser automation
         if "VideoArchivePlayer" in url:
             if self.use_browser:
+                # A single HEAD request is far cheaper than booting the player
+                direct_url = self._probe_direct_url(url)
+                if direct_url:
+                    return direct_url
                 logger.info(f"Using browser automation to extract video URL from player page: {url}")
-                return self._extract_with_browser(url)
+                return self._browser_thread.submit(self._extract_with_browser, url).result()
             else:
                 # Return as-is, let video_downloader handle it
                 return url
@@ -58,30 +80,67 @@ class BlobHandler:
         
         # Use browser automation to extract blob URL
         try:
-            return self._extract_with_browser(url)
+            return self._browser_thread.submit(self._extract_with_browser, url).result()
         except Exception as e:
             logger.error(f"Error extracting blob URL: {e}", exc_info=True)
             return None
     
+    def _probe_direct_url(self, url: str) -> Optional[str]:
+        """Return the direct MP4 behind a House player page if a HEAD request finds it"""
+        video_param = parse_qs(urlparse(url).query).get("video", [None])[0]
+        if not video_param:
+            return None
+        
+        direct_url = f"{HOUSE_DIRECT_VIDEO_BASE_URL}/{video_param}"
+        try:
+            response = self._session.head(direct_url, timeout=5, allow_redirects=True, verify=False)
+        except requests.RequestException as e:
+            logger.debug(f"HEAD probe failed for {direct_url}: {e}")
+            return None
+        
+        if response.status_code == 200:
+            logger.debug(f"Direct video URL found without browser: {direct_url}")
+            return direct_url
+        return None
+    
+    def _get_browser(self):
+        """Launch Chromium on first use and keep it for later extractions"""
+        if self._browser is None:
+            from playwright.sync_api import sync_playwright
+            
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True)
+        return self._browser
+    
     def _extract_with_browser(self, url: str) -> Optional[str]:
         """Extract video URL using browser automation"""
         try:
-            from playwright.sync_api import sync_playwright
+            from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
             
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
+            # A fresh context per page keeps extractions isolated while
+            # paying the Chromium startup cost only once
+            context = self._get_browser().new_context()
+            try:
+                # Abort asset requests; documents, scripts and XHR/fetch still load
+                # so the player bootstraps normally
+                context.route(_BLOCKED_ASSET_RE, lambda route: route.abort())
+                page = context.new_page()
                 
-                # Navigate to page
-                page.goto(url, wait_until="networkidle")
+                # Blob-backed players: return the first manifest the page requests as
+                # soon as it is issued instead of waiting for the network to go idle
+                try:
+                    with page.expect_request(_MANIFEST_RE, timeout=MANIFEST_WAIT_MS) as request_info:
+                        page.goto(url, wait_until="domcontentloaded")
+                    return request_info.value.url
+                except PlaywrightTimeoutError:
+                    logger.debug(f"No stream manifest requested by {url}, checking video element")
                 
                 # Find video element
                 video_element = page.query_selector("video")
                 if video_element:
                     # Get video source
                     video_src = video_element.get_attribute("src")
-                    if video_src:
-                        browser.close()
+                    if video_src and not video_src.startswith("blob:"):
                         return video_src
                     
                     # Try source elements
@@ -89,11 +148,10 @@ class BlobHandler:
                     for source in source_elements:
                         src = source.get_attribute("src")
                         if src and not src.startswith("blob:"):
-                            browser.close()
                             return src
-                
-                browser.close()
                 return None
+            finally:
+                context.close()
                 
         except ImportError:
             logger.error(
@@ -106,10 +164,21 @@ class BlobHandler:
     
     def cleanup(self):
         """Cleanup browser resources if needed"""
+        if self._browser or self._playwright:
+            self._browser_thread.submit(self._close_browser).result()
+    
+    def _close_browser(self):
+        """Close the browser and stop Playwright (runs on the browser thread)"""
         if self._browser:
             try:
                 self._browser.close()
             except Exception:
                 pass
             self._browser = None
+        if self._playwright:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
 
@@ -8,15 +8,8 @@ from typing import Optional
 from urllib.parse import urlparse, urljoin, parse_qs
 
 import requests
-from bs4 import BeautifulSoup
 from tqdm import tqdm
 
-try:
-    import yt_dlp
-    YT_DLP_AVAILABLE = True
-except ImportError:
-    YT_DLP_AVAILABLE = False
-
 from ..models import DownloadResult
 from ..utils import get_logger
 
@@ -25,6 +18,34 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = get_logger(__name__)
 
+# yt-dlp is heavy and optional; it is imported on first use (see _get_ytdlp)
+_YTDLP = None
+
+# Path extensions that identify a direct video/stream URL
+_DIRECT_EXTS = (".mp4", ".m3u8", ".m4v", ".mov")
+
+# URL substrings that route a download through yt-dlp (+ aria2c):
+# HLS streams, House/Senate player pages and their CDN hosts
+_YTDLP_MARKERS = (
+    ".m3u8",
+    "VideoArchivePlayer",
+    "cloud.castus.tv",
+    "house.mi.gov",
+    "cloudfront.net",
+)
+
+
+def _get_ytdlp():
+    """Import yt-dlp on first use; returns None if it is not installed"""
+    global _YTDLP
+    if _YTDLP is None:
+        try:
+            import yt_dlp
+        except ImportError:
+            return None
+        _YTDLP = yt_dlp
+    return _YTDLP
+
 
 class VideoDownloader:
     """Downloads videos with streaming, progress tracking, and retry logic"""
@@ -34,11 +55,15 @@ class VideoDownloader:
         max_retries: int = 3,
         timeout: int = 300,
         chunk_size: int = 1024 * 1024,  # 1MB Chunks
+        session: Optional[requests.Session] = None,
     ):
-        """Initialize video downloader"""
+        """Initialize video downloader (session lets callers share a connection pool)"""
         self.max_retries = max_retries
         self.timeout = timeout
         self.chunk_size = chunk_size
+        self._session = session or requests.Session()
+        # Output directories already created by this downloader
+        self._ensured_dirs: set[Path] = set()
     
     def download(
         self,
@@ -57,19 +82,26 @@ class VideoDownloader:
         Returns:
             DownloadResult with success status and details
         """
-        logger.debug(f"[VIDEO_DOWNLOADER] download() called - video_id={video_id}, url={url}")
+        logger.debug("[VIDEO_DOWNLOADER] download() called - video_id=%s, url=%s", video_id, url)
         
-        # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Ensure output directory exists (once per directory)
+        parent = output_path.parent
+        if parent not in self._ensured_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(parent)
         
-        # Check if file already exists
-        if output_path.exists():
-            logger.debug(f"[VIDEO_DOWNLOADER] File already exists: {output_path}")
+        # Check if file already exists (single stat call)
+        try:
+            existing = output_path.stat()
+        except FileNotFoundError:
+            pass
+        else:
+            logger.debug("[VIDEO_DOWNLOADER] File already exists: %s", output_path)
             return DownloadResult(
                 success=True,
                 video_id=video_id,
                 file_path=output_path,
-                bytes_downloaded=output_path.stat().st_size,
+                bytes_downloaded=existing.st_size,
             )
         
         # Use yt-dlp for:
@@ -77,47 +109,18 @@ class VideoDownloader:
         # 2. Senate player pages (cloud.castus.tv)
         # 3. Any URL from House or Senate domains (to enable multi-threaded aria2c via aria2c)
         # Note: House videos are now direct MP4 URLs, but yt-dlp with aria2c still provides faster downloads
-        use_ytdlp = (
-            url.endswith('.m3u8') or 
-            '.m3u8' in url or 
-            'VideoArchivePlayer' in url or
-            'cloud.castus.tv' in url or
-            'house.mi.gov' in url or
-            'cloudfront.net' in url
-        )
-        
-        # #region agent log
-        try:
-            import json
-            from datetime import datetime
-            with open("/Users/leultesfaye/Desktop/StateAffair-Interview/.cursor/debug.log", "a") as log_f:
-                log_f.write(json.dumps({
-                    "sessionId": "speed-debug",
-                    "runId": "speed-test-1",
-                    "hypothesisId": "SYSTEM",
-                    "location": "video_downloader.py:88",
-                    "message": "Download method selected",
-                    "data": {
-                        "url": url,
-                        "use_ytdlp": use_ytdlp,
-                        "YT_DLP_AVAILABLE": YT_DLP_AVAILABLE
-                    },
-                    "timestamp": int(datetime.now().timestamp() * 1000)
-                }) + "\n")
-        except: pass
-        # #endregion
-        
-        logger.debug(f"[VIDEO_DOWNLOADER] use_ytdlp={use_ytdlp} (url ends with .m3u8: {url.endswith('.m3u8')}, contains .m3u8: {'.m3u8' in url}, contains VideoArchivePlayer: {'VideoArchivePlayer' in url}, contains cloud.castus.tv: {'cloud.castus.tv' in url})")
+        use_ytdlp = any(marker in url for marker in _YTDLP_MARKERS)
+        logger.debug("[VIDEO_DOWNLOADER] use_ytdlp=%s for url=%s", use_ytdlp, url)
         
         if use_ytdlp:
-            if not YT_DLP_AVAILABLE:
-                logger.error(f"[VIDEO_DOWNLOADER] yt-dlp not available")
+            if _get_ytdlp() is None:
+                logger.error("[VIDEO_DOWNLOADER] yt-dlp not available")
                 return DownloadResult(
                     success=False,
                     video_id=video_id,
                     error_message="yt-dlp is required but not installed. Install with: pip install yt-dlp",
                 )
-            logger.debug(f"[VIDEO_DOWNLOADER] Calling _download_with_ytdlp()")
+            logger.debug("[VIDEO_DOWNLOADER] Calling _download_with_ytdlp()")
             return self._download_with_ytdlp(url, output_path, video_id)
         
         # For direct MP4 files, use requests with retries
@@ -152,7 +155,7 @@ class VideoDownloader:
         try:
             # Start request with streaming
             # Note: verify=False is used here due to SSL certificate issues on some systems
-            response = requests.get(
+            response = self._session.get(
                 url,
                 stream=True,
                 timeout=self.timeout,
@@ -163,66 +166,29 @@ class VideoDownloader:
             )
             response.raise_for_status()
             
-            # Get file size if available
+            # Get file size if available (chunked responses carry no length)
             total_size = int(response.headers.get("content-length", 0))
+            if response.headers.get("transfer-encoding", "").lower() == "chunked":
+                total_size = 0
             
-            # Download with progress bar
+            # Download with progress bar (tqdm shows activity only when total is None)
             bytes_downloaded = 0
             first_chunk = None
-            start_time = time.time()
-            chunk_times = []
             
-            with open(output_path, "wb") as f:
-                if total_size > 0:
-                    # Known size - use progress bar
-                    with tqdm(
-                        total=total_size,
-                        unit="B",
-                        unit_scale=True,
-                        desc=f"Downloading {video_id[:20]}",
-                    ) as pbar:
-                        for chunk in response.iter_content(chunk_size=self.chunk_size):
-                            if chunk:
-                                # #region agent log
-                                c_start = time.time()
-                                # #endregion
-                                if first_chunk is None:
-                                    first_chunk = chunk[:1024]  # Save first 1KB for validation
-                                f.write(chunk)
-                                bytes_downloaded += len(chunk)
-                                pbar.update(len(chunk))
-                                # #region agent log
-                                c_end = time.time()
-                                chunk_times.append(c_end - c_start)
-                                if len(chunk_times) % 50 == 0:
-                                    try:
-                                        import json
-                                        from datetime import datetime
-                                        with open("/Users/leultesfaye/Desktop/StateAffair-Interview/.cursor/debug.log", "a") as log_f:
-                                            log_f.write(json.dumps({
-                                                "sessionId": "speed-debug",
-                                                "runId": "speed-test-1",
-                                                "hypothesisId": "B",
-                                                "location": "video_downloader.py:165",
-                                                "message": "Requests Chunk Performance",
-                                                "data": {
-                                                    "chunk_size": self.chunk_size,
-                                                    "avg_chunk_time": sum(chunk_times[-50:]) / 50,
-                                                    "bytes_downloaded": bytes_downloaded,
-                                                    "total_size": total_size
-                                                },
-                                                "timestamp": int(datetime.now().timestamp() * 1000)
-                                            }) + "\n")
-                                    except: pass
-                                # #endregion
-                else:
-                    # Unknown size - just show activity
-                    with tqdm(unit="B", unit_scale=True, desc=f"Downloading {video_id[:20]}") as pbar:
-                        for chunk in response.iter_content(chunk_size=self.chunk_size):
-                            if chunk:
-                                f.write(chunk)
-                                bytes_downloaded += len(chunk)
-                                pbar.update(len(chunk))
+            with open(output_path, "wb") as f, tqdm(
+                total=total_size or None,
+                unit="B",
+                unit_scale=True,
+                desc=f"Downloading {video_id[:20]}",
+            ) as pbar:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if not chunk:
+                        continue
+                    if first_chunk is None:
+                        first_chunk = chunk[:1024]  # Save first 1KB for validation
+                    f.write(chunk)
+                    bytes_downloaded += len(chunk)
+                    pbar.update(len(chunk))
             
             # Validate that we downloaded a video file, not HTML
             if first_chunk:
@@ -273,8 +239,10 @@ class VideoDownloader:
         video_id: str,
     ) -> DownloadResult:
         """Download HLS stream (m3u8) or direct URL using yt-dlp with speed optimizations"""
-        logger.debug(f"[VIDEO_DOWNLOADER] _download_with_ytdlp() called - video_id={video_id}, url={url}")
+        logger.debug("[VIDEO_DOWNLOADER] _download_with_ytdlp() called - video_id=%s, url=%s", video_id, url)
         try:
+            yt_dlp = _get_ytdlp()
+            
             # Determine referer based on URL source
             if 'house.mi.gov' in url or 'VideoArchivePlayer' in url:
                 referer = 'https://house.mi.gov/'
@@ -331,44 +299,10 @@ class VideoDownloader:
                 },
             }
             
-            # #region agent log
-            try:
-                import json
-                from datetime import datetime
-                with open("/Users/leultesfaye/Desktop/StateAffair-Interview/.cursor/debug.log", "a") as log_f:
-                    log_f.write(json.dumps({
-                        "sessionId": "speed-debug",
-                        "runId": "speed-test-1",
-                        "hypothesisId": "A,C",
-                        "location": "video_downloader.py:281",
-                        "message": "Starting yt-dlp download",
-                        "data": {
-                            "url": url,
-                            "ydl_opts_fragment_concurrency": ydl_opts.get('concurrent_fragments'),
-                            "aria2c_args": ydl_opts.get('external_downloader_args')
-                        },
-                        "timestamp": int(datetime.now().timestamp() * 1000)
-                    }) + "\n")
-            except: pass
-            # #endregion
-
+            logger.debug("[VIDEO_DOWNLOADER] Starting yt-dlp download - video_id=%s", video_id)
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
-            
-            # #region agent log
-            try:
-                with open("/Users/leultesfaye/Desktop/StateAffair-Interview/.cursor/debug.log", "a") as log_f:
-                    log_f.write(json.dumps({
-                        "sessionId": "speed-debug",
-                        "runId": "speed-test-1",
-                        "hypothesisId": "A,C",
-                        "location": "video_downloader.py:295",
-                        "message": "Finished yt-dlp download",
-                        "data": {"video_id": video_id},
-                        "timestamp": int(datetime.now().timestamp() * 1000)
-                    }) + "\n")
-            except: pass
-            # #endregion
+            logger.debug("[VIDEO_DOWNLOADER] Finished yt-dlp download - video_id=%s", video_id)
             
             pbar.close()
             
@@ -418,12 +352,12 @@ class VideoDownloader:
     
     def get_direct_video_url(self, url: str) -> Optional[str]:
         """Check if URL is a direct video URL"""
-        logger.debug(f"[VIDEO_DOWNLOADER] get_direct_video_url() called with: {url}")
+        logger.debug("[VIDEO_DOWNLOADER] get_direct_video_url() called with: %s", url)
         parsed = urlparse(url)
         
         # Check if it's already a direct video URL (path ends with extension, not query string)
         path = parsed.path
-        if path.endswith((".mp4", ".m3u8", ".m4v", ".mov")):
+        if path.endswith(_DIRECT_EXTS):
             return url
         
         # For m3u8 URLs, return as-is
@@ -11,8 +11,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from .utils import load_config
-from .database import get_db_manager
-from .services import StateService, DiscoveryService, DownloadService
 from .utils.logger import get_logger
 
 logger = get_logger(__name__, service_name="cli")
@@ -35,6 +33,9 @@ def discover(source, days, async_mode):
         return
 
     # Synchronous mode
+    from .database import get_db_manager
+    from .services import StateService, DiscoveryService
+    
     db_manager = get_db_manager()
     discovery_service = DiscoveryService()
     state_service = StateService(db_manager)
@@ -42,8 +43,7 @@ def discover(source, days, async_mode):
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     videos = discovery_service.discover_videos(cutoff_date=cutoff_date, source=source)
     
-    for video in videos:
-        state_service.mark_video_discovered(video)
+    state_service.mark_videos_discovered(videos)
     
     click.echo(f"Discovered {len(videos)} videos.")
 
@@ -60,6 +60,7 @@ def process(video_id, source):
 def test_infra():
     """Test connection to DB and Redis"""
     try:
+        from .database import get_db_manager
         db = get_db_manager()
         # Fix: call execute on a text object
         from sqlalchemy import text
@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadResult:
     """Result of a video download operation"""
     
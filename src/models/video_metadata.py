@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class VideoMetadata:
     """Standardized video metadata from archive sources"""
     
@@ -10,6 +10,9 @@ from ..models import VideoMetadata
 class BaseScraper(ABC):
     """Abstract base class for archive scrapers"""
     
+    # Empty so subclasses that declare __slots__ carry no per-instance __dict__
+    __slots__ = ()
+    
     @abstractmethod
     def discover_videos(
         self,
@@ -32,15 +35,28 @@ class BaseScraper(ABC):
         """
         pass
 
-    def resolve_stream_url(self, video: VideoMetadata) -> Optional[str]:
+    def resolve_stream_url(self, video: VideoMetadata, verify: bool = False) -> Optional[str]:
         """
         Resolve the final stream URL for a video (optional)
         
         Args:
             video: VideoMetadata object
+            verify: Check the URL over the network where the scraper supports it
             
         Returns:
             Direct stream URL (m3u8 or mp4) if resolvable, else None
         """
         return None
 
+
+    def resolve_stream_urls(self, videos: List[VideoMetadata]) -> List[Optional[str]]:
+        """
+        Resolve stream URLs for many videos (scrapers may override to run concurrently)
+        
+        Args:
+            videos: VideoMetadata objects to resolve
+            
+        Returns:
+            Stream URLs in the same order as videos (None where unresolved)
+        """
+        return [self.resolve_stream_url(video) for video in videos]
@@ -1,31 +1,87 @@
 """House archive scraper"""
 
-import re
 import urllib3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from functools import partial
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+from lxml.etree import XPath
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .base_scraper import BaseScraper
 from ..models import VideoMetadata
 from ..utils import parse_house_date, get_logger
+from ..utils.cache import get_cache
 
 # Suppress SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = get_logger(__name__)
 
+# Upper bound on concurrent per-year archive fetches
+MAX_ARCHIVE_FETCH_WORKERS = 8
+
+# Precompiled XPath queries for the archive markup (evaluated in libxml2)
+_COMMITTEE_ITEMS_XPATH = XPath("//li[.//strong and .//a[contains(@href, '/VideoArchivePlayer?video=')]]")
+_COMMITTEE_NAME_XPATH = XPath("string((.//strong)[1])")
+_VIDEO_LINKS_XPATH = XPath(".//a[contains(@href, '/VideoArchivePlayer?video=')]")
+
+# Archive HTML is cached per (archive_url, year); past years never expire
+ARCHIVE_CACHE_NAME = "house_archive"
+CURRENT_YEAR_ARCHIVE_TTL = 600
+
+# Direct MP4 files live at {DIRECT_VIDEO_BASE_URL}/{video param}
+DIRECT_VIDEO_BASE_URL = "https://www.house.mi.gov/ArchiveVideoFiles"
+
+# Verified stream URLs are cached on disk by video_id for this long (seconds)
+STREAM_CACHE_NAME = "house_streams"
+STREAM_CACHE_TTL = 7 * 24 * 3600
+
+# Player link query parameter, e.g. /VideoArchivePlayer?video=HAGRI-022025.mp4
+_VIDEO_PARAM = "video="
+_MP4_SUFFIX = ".mp4"
+
+
+def _video_param(url: str) -> Optional[str]:
+    """Extract the video= query value from a player URL (None if absent)"""
+    _, sep, tail = url.partition(_VIDEO_PARAM)
+    if not sep:
+        return None
+    return tail.partition("&")[0] or None
+
 
 class HouseScraper(BaseScraper):
     """Scraper for Michigan House archive"""
     
+    __slots__ = ("archive_url", "base_url", "_session")
+    
     def __init__(self, archive_url: str = "https://house.mi.gov/VideoArchive"):
         """Initialize House scraper"""
         self.archive_url = archive_url
         self.base_url = "https://house.mi.gov"
+        # Shared across fetch threads so connections are kept alive between requests
+        self._session = requests.Session()
+        # pool_block caps concurrent connections to the host at pool_maxsize (extra threads
+        # wait for a free connection); 429/503 back off, honouring Retry-After
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            pool_block=True,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+        )
+        self._session.mount("https://", adapter)
+        self._session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            # Archive pages are multi-MB HTML; br is decoded by urllib3 when brotli is installed
+            "Accept-Encoding": "gzip, br",
+            "Connection": "keep-alive",
+        })
     
     def discover_videos(
         self,
@@ -33,8 +89,9 @@ class HouseScraper(BaseScraper):
         limit: Optional[int] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        force_refresh: bool = False,
     ) -> List[VideoMetadata]:
-        """Discover videos from House archive"""
+        """Discover videos from House archive (force_refresh bypasses the archive HTML cache)"""
         # Determine date range for filtering
         if start_date and end_date:
             logger.info(f"Discovering videos from House archive between {start_date.date()} and {end_date.date()}")
@@ -55,57 +112,69 @@ class HouseScraper(BaseScraper):
             logger.info(f"Fetching House archive for years: {years_to_fetch}")
             
             all_videos = []
+            discovered_at = datetime.now()  # one timestamp for the whole run
+            seen = set()  # video_ids already collected (years can overlap at boundaries)
             
-            # Fetch each year's archive
-            for year in years_to_fetch:
-                try:
-                    html_content = self._fetch_archive_for_year(year)
-                    if html_content:
-                        year_videos = self._parse_archive_html(html_content, filter_start, filter_end, limit, len(all_videos))
-                        all_videos.extend(year_videos)
-                        
-                        if limit and len(all_videos) >= limit:
-                            break
-                except Exception as e:
-                    logger.warning(f"Failed to fetch archive for year {year}: {e}")
-                    continue
-            
-            # Apply final date filtering
-            if filter_end:
-                filtered_videos = [
-                    v for v in all_videos
-                    if filter_start <= v.date_recorded <= filter_end
-                ]
-            else:
-                filtered_videos = [
-                    v for v in all_videos
-                    if v.date_recorded >= filter_start
+            # Fetch all years concurrently, then parse them in year order
+            max_workers = min(MAX_ARCHIVE_FETCH_WORKERS, len(years_to_fetch))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._fetch_archive_for_year, year, force_refresh)
+                    for year in years_to_fetch
                 ]
+                for year, future in zip(years_to_fetch, futures):
+                    try:
+                        html_content = future.result()
+                        if html_content:
+                            year_videos = self._parse_archive_html(
+                                html_content, filter_start, filter_end, limit, len(all_videos), seen, discovered_at
+                            )
+                            all_videos.extend(year_videos)
+                            
+                            if limit and len(all_videos) >= limit:
+                                # Enough videos - drop fetches that have not started yet
+                                for pending in futures:
+                                    pending.cancel()
+                                break
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch archive for year {year}: {e}")
+                        continue
             
-            # Apply limit if specified
-            if limit and len(filtered_videos) > limit:
-                filtered_videos = filtered_videos[:limit]
-            
-            logger.info(f"Discovered {len(filtered_videos)} videos from House archive")
-            return filtered_videos
+            # Date range and limit are already enforced while parsing
+            logger.info(f"Discovered {len(all_videos)} videos from House archive")
+            return all_videos
             
         except Exception as e:
             logger.error(f"Error discovering House videos: {e}", exc_info=True)
             return []
     
-    def _fetch_archive_for_year(self, year: int) -> Optional[str]:
+    def _fetch_archive_for_year(self, year: int, force_refresh: bool = False) -> Optional[str]:
+        """Fetch archive HTML for a year, served from the on-disk cache when fresh"""
+        cache = get_cache(ARCHIVE_CACHE_NAME)
+        key = (self.archive_url, year)
+        if not force_refresh:
+            html_content = cache.get(key)
+            if html_content is not None:
+                logger.debug(f"Using cached House archive for year {year}")
+                return html_content
+        
+        html_content = self._fetch_archive_for_year_uncached(year)
+        if html_content:
+            # Past years no longer change; the current year is still being added to
+            expire = CURRENT_YEAR_ARCHIVE_TTL if year >= datetime.now().year else None
+            cache.set(key, html_content, expire=expire)
+        return html_content
+    
+    def _fetch_archive_for_year_uncached(self, year: int) -> Optional[str]:
         """Fetch archive HTML for a specific year using handler endpoint"""
         try:
             handler_url = f"{self.archive_url}?handler=ArchiveVideoPartial&Year={year}&Type=All&Date="
             logger.debug(f"Fetching House archive for year {year}: {handler_url}")
             
-            response = requests.get(
+            response = self._session.get(
                 handler_url,
                 timeout=30,
                 verify=False,  # Disable SSL verification (fix certificates in production)
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
             )
             response.raise_for_status()
             
@@ -122,53 +191,56 @@ class HouseScraper(BaseScraper):
         filter_end: Optional[datetime],
         limit: Optional[int],
         current_count: int,
+        seen: Optional[set] = None,
+        discovered_at: Optional[datetime] = None,
     ) -> List[VideoMetadata]:
-        """Parse HTML content and extract video metadata"""
-        soup = BeautifulSoup(html_content, "html.parser")
-        videos = []
+        """Parse HTML content and extract video metadata (skipping video_ids in seen)"""
+        if seen is None:
+            seen = set()
         
-        # Find all committee sections
-        committee_items = soup.find_all("li")
+        # Videos still wanted from this page (None = unlimited)
+        remaining = limit - current_count if limit else None
+        if remaining is not None and remaining <= 0:
+            return []
         
-        for item in committee_items:
-            # Find committee name and video count
-            strong_tag = item.find("strong")
-            if not strong_tag:
-                continue
-            
-            committee_text = strong_tag.get_text(strip=True)
-            committee_name = committee_text.split("|")[0].strip()
-            
-            # Find video links in this committee
-            video_links = item.find_all("a", href=True)
+        tree = lxml_html.fromstring(html_content)
+        videos = self._iter_videos(tree, filter_start, filter_end, seen, discovered_at)
+        # islice stops pulling links as soon as the limit is met
+        return list(islice(videos, remaining))
+    
+    def _iter_videos(
+        self,
+        tree,
+        filter_start: datetime,
+        filter_end: Optional[datetime],
+        seen: set,
+        discovered_at: Optional[datetime] = None,
+    ) -> Iterator[VideoMetadata]:
+        """Yield in-range videos from a parsed archive page, adding their ids to seen"""
+        for committee_name, href, link_text in self._iter_video_links(tree):
+            video = self._parse_video_link(
+                href=href,
+                link_text=link_text,
+                committee=committee_name,
+                cutoff_date=filter_start,
+                end_date=filter_end,
+                discovered_at=discovered_at,
+            )
             
-            for link in video_links:
-                href = link.get("href", "")
-                link_text = link.get_text(strip=True)
-                
-                # Check if this is a video link
-                if "/VideoArchivePlayer?video=" in href:
-                    video = self._parse_video_link(
-                        href=href,
-                        link_text=link_text,
-                        committee=committee_name,
-                        cutoff_date=filter_start,
-                    )
-                    
-                    if video:
-                        # Apply end date filter if specified
-                        if filter_end and video.date_recorded > filter_end:
-                            continue
-                        
-                        videos.append(video)
-                        
-                        if limit and (current_count + len(videos)) >= limit:
-                            break
+            if video and video.video_id not in seen:
+                seen.add(video.video_id)
+                yield video
+    
+    def _iter_video_links(self, tree) -> Iterator[Tuple[str, str, str]]:
+        """Yield (committee, href, link_text) for each video link on an archive page"""
+        # Committee sections are the <li> items carrying a <strong> title and
+        # at least one video link; the filtering happens inside libxml2
+        for item in _COMMITTEE_ITEMS_XPATH(tree):
+            # Committee name (title is "Name | N videos")
+            committee_name = _COMMITTEE_NAME_XPATH(item).strip().split("|")[0].strip()
             
-            if limit and (current_count + len(videos)) >= limit:
-                break
-        
-        return videos
+            for link in _VIDEO_LINKS_XPATH(item):
+                yield committee_name, link.get("href", ""), " ".join(link.text_content().split())
     
     def _parse_video_link(
         self,
@@ -176,77 +248,126 @@ class HouseScraper(BaseScraper):
         link_text: str,
         committee: str,
         cutoff_date: datetime,
+        end_date: Optional[datetime] = None,
+        discovered_at: Optional[datetime] = None,
     ) -> Optional[VideoMetadata]:
         """Parse a video link into VideoMetadata"""
-        try:
-            # Extract video filename from URL
-            # Format: /VideoArchivePlayer?video=HAGRI-022025.mp4
-            match = re.search(r"video=([^&]+)", href)
-            if not match:
-                return None
-            
-            filename = match.group(1)
-            video_id = filename.replace(".mp4", "")
-            
-            # Parse date from link text
-            # Format: "Thursday, February 20, 2025"
-            date_recorded = parse_house_date(link_text)
-            if not date_recorded:
-                logger.warning(f"Could not parse date from: {link_text}")
-                return None
-            
-            # Filter by cutoff date (basic filter, more filtering happens in discover_videos)
-            if date_recorded < cutoff_date:
-                return None
-            
-            # Construct full URL
-            video_url = urljoin(self.base_url, href)
-            
-            return VideoMetadata(
-                video_id=video_id,
-                source="house",
-                filename=filename,
-                url=video_url,
-                date_recorded=date_recorded,
-                committee=committee,
-                title=f"{committee} - {link_text}",
-            )
-            
-        except Exception as e:
-            logger.error(f"Error parsing video link {href}: {e}", exc_info=True)
+        # Extract video filename from URL
+        # Format: /VideoArchivePlayer?video=HAGRI-022025.mp4
+        filename = _video_param(href)
+        if not filename:
             return None
+        
+        video_id = filename[:-len(_MP4_SUFFIX)] if filename.endswith(_MP4_SUFFIX) else filename
+        
+        # Parse date from link text
+        # Format: "Thursday, February 20, 2025"
+        date_recorded = parse_house_date(link_text)
+        if not date_recorded:
+            logger.warning(f"Could not parse date from: {link_text}")
+            return None
+        
+        # Filter by date range before building the URL and metadata
+        if date_recorded < cutoff_date:
+            return None
+        if end_date and date_recorded > end_date:
+            return None
+        
+        # Construct full URL
+        video_url = urljoin(self.base_url, href)
+        
+        return VideoMetadata(
+            video_id=video_id,
+            source="house",
+            filename=filename,
+            url=video_url,
+            date_recorded=date_recorded,
+            committee=committee,
+            title=f"{committee} - {link_text}",
+            date_discovered=discovered_at,
+        )
 
-    def resolve_stream_url(self, video: VideoMetadata) -> Optional[str]:
-        """Resolve the final stream URL for House videos - direct MP4 URL"""
+    def resolve_stream_urls(
+        self,
+        videos: List[VideoMetadata],
+        max_workers: int = 16,
+        verify: bool = False,
+    ) -> List[Optional[str]]:
+        """
+        Resolve stream URLs for many videos
+        
+        Args:
+            videos: VideoMetadata objects to resolve
+            max_workers: Maximum concurrent HEAD verifications (kept <= session pool size)
+            verify: Verify each URL with a HEAD request (runs concurrently)
+        
+        Returns:
+            Stream URLs in the same order as videos (None where unresolved)
+        """
+        if not verify:
+            # Pure string construction - nothing to parallelize
+            return [self.resolve_stream_url(video) for video in videos]
+        if not videos:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(videos))) as executor:
+            return list(executor.map(partial(self.resolve_stream_url, verify=True), videos))
+
+    def resolve_stream_url(self, video: VideoMetadata, verify: bool = False) -> Optional[str]:
+        """
+        Resolve the final stream URL for House videos - direct MP4 URL
+        
+        The direct URL is derived mechanically from the player URL, so by default it
+        is returned without any network call (the downloader handles missing files).
+        With verify=True it is checked with a HEAD request and the verified result is
+        cached on disk by video_id.
+        """
+        if not verify:
+            return self._direct_mp4_url(video)
+        
+        cache = get_cache(STREAM_CACHE_NAME)
+        stream_url = cache.get(video.video_id)
+        if stream_url is not None:
+            return stream_url
+        
+        stream_url = self._resolve_stream_url_uncached(video)
+        if stream_url:
+            cache.set(video.video_id, stream_url, expire=STREAM_CACHE_TTL)
+        return stream_url
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached House stream URLs"""
+        get_cache(STREAM_CACHE_NAME).clear()
+
+    def _direct_mp4_url(self, video: VideoMetadata) -> Optional[str]:
+        """Build the direct MP4 URL from the player URL's video parameter"""
+        # Extract video filename from URL
+        # Format: /VideoArchivePlayer?video=HCOMT-022525.mp4
+        video_param = _video_param(video.url)
+        
+        if not video_param:
+            logger.warning(f"Could not extract video parameter from URL: {video.url}")
+            return None
+        
+        return f"{DIRECT_VIDEO_BASE_URL}/{video_param}"
+
+    def _resolve_stream_url_uncached(self, video: VideoMetadata) -> Optional[str]:
+        """Resolve the direct MP4 URL and verify it with a HEAD request"""
         try:
-            from urllib.parse import urlparse, parse_qs
-            
-            player_url = video.url
-            logger.info(f"Resolving House stream URL: {player_url}")
+            logger.info(f"Resolving House stream URL: {video.url}")
             
-            # Extract video filename from URL
-            # Format: /VideoArchivePlayer?video=HCOMT-022525.mp4
-            parsed_query = parse_qs(urlparse(player_url).query)
-            video_param = parsed_query.get('video', [None])[0]
-            
-            if not video_param:
-                logger.warning(f"Could not extract video parameter from URL: {player_url}")
+            direct_url = self._direct_mp4_url(video)
+            if not direct_url:
                 return None
-            
-            # Construct direct MP4 URL
-            direct_url = f"https://www.house.mi.gov/ArchiveVideoFiles/{video_param}"
             logger.info(f"Using direct MP4 URL: {direct_url}")
             
             # Verify the file exists with a HEAD request
             try:
-                response = requests.head(
+                response = self._session.head(
                     direct_url,
                     timeout=10,
                     verify=False,
                     allow_redirects=True,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                    }
                 )
                 
                 # Check if the URL is valid
@@ -265,7 +386,7 @@ class HouseScraper(BaseScraper):
                     final_url = response.headers.get('Location', direct_url)
                     logger.info(f"Direct URL redirects to: {final_url}")
                     # Try the redirect URL
-                    redirect_check = requests.head(final_url, timeout=10, verify=False, allow_redirects=True)
+                    redirect_check = self._session.head(final_url, timeout=10, verify=False, allow_redirects=True)
                     if redirect_check.status_code == 200:
                         content_type = redirect_check.headers.get('Content-Type', '').lower()
                         if 'video' in content_type or 'mp4' in content_type:
@@ -1,36 +1,84 @@
 """Senate archive scraper"""
 
-import json
-import re
+import logging
 import urllib3
-from datetime import datetime
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 
+import orjson
 import requests
+from dateutil import parser as date_parser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .base_scraper import BaseScraper
 from ..models import VideoMetadata
 from ..utils import parse_senate_date, get_logger
+from ..utils.cache import get_cache
 
 # Suppress SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = get_logger(__name__)
 
-# Debug log path
-DEBUG_LOG_PATH = Path("/Users/leultesfaye/Desktop/StateAffair-Interview/.cursor/debug.log")
+# Castus-resolved stream URLs are cached on disk by video_id for this long (seconds)
+STREAM_CACHE_NAME = "senate_streams"
+STREAM_CACHE_TTL = 7 * 24 * 3600
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare with the API's aware timestamps"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _first(data: Dict[str, Any], *keys: str, default: Any = None) -> Any:
+    """Return the first truthy value among keys (the API varies field names between records)"""
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return value
+    return default
 
 
 class SenateScraper(BaseScraper):
     """Scraper for Michigan Senate archive"""
     
+    __slots__ = ("api_url", "_session", "_list_key")
+    
     def __init__(
         self,
         api_url: str = "https://2kbyogxrg4.execute-api.us-west-2.amazonaws.com/61b3adc8124d7d000891ca5c/home/recent",
     ):
         """Initialize Senate scraper"""
         self.api_url = api_url
+        # Response key that held the video list last time (the API shape is stable)
+        self._list_key: Optional[str] = None
+        # Shared by discovery and the concurrent Castus resolution calls so
+        # connections to the API hosts are kept alive between requests
+        self._session = requests.Session()
+        # pool_block caps concurrent connections per host at pool_maxsize; rate-limit and
+        # server errors back off (honouring Retry-After), including the read-only Castus POST
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            pool_block=True,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            ),
+        )
+        self._session.mount("https://", adapter)
+        # The APIs require browser-like headers to return data
+        self._session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Origin': 'https://cloud.castus.tv',
+            'Referer': 'https://cloud.castus.tv/vod/misenate/',
+        })
     
     def discover_videos(
         self,
@@ -51,24 +99,15 @@ class SenateScraper(BaseScraper):
         try:
             # Call API to get all videos
             # Note: verify=False is used here due to SSL certificate issues on some systems
-            # The API requires browser-like headers to return data
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'application/json, text/plain, */*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Origin': 'https://cloud.castus.tv',
-                'Referer': 'https://cloud.castus.tv/vod/misenate/',
-            }
-            response = requests.get(
+            response = self._session.get(
                 self.api_url,
-                headers=headers,
                 timeout=30,
                 verify=False,  # Disable SSL verification (fix certificates in production)
             )
             
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
             response.raise_for_status()
             
@@ -76,24 +115,12 @@ class SenateScraper(BaseScraper):
             videos = []
             video_list = self._extract_video_list(data)
             
-            # #region agent log
-            try:
-                with open(DEBUG_LOG_PATH, "a") as f:
-                    f.write(json.dumps({
-                        "sessionId": "senate-api-debug",
-                        "runId": "post-fix",
-                        "hypothesisId": "E",
-                        "location": "senate_scraper.py:100",
-                        "message": "Extracted video list",
-                        "data": {
-                            "video_list_length": len(video_list),
-                            "first_item_keys": list(video_list[0].keys()) if video_list and isinstance(video_list[0], dict) else "no_items",
-                            "first_item_sample": str(video_list[0])[:300] if video_list else "empty"
-                        },
-                        "timestamp": int(datetime.now().timestamp() * 1000)
-                    }) + "\n")
-            except: pass
-            # #endregion
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Extracted video list: len=%d keys=%s",
+                    len(video_list),
+                    list(video_list[0].keys()) if video_list and isinstance(video_list[0], dict) else None,
+                )
             
             if not video_list:
                 logger.warning(
@@ -102,19 +129,20 @@ class SenateScraper(BaseScraper):
                     f"This may indicate the API requires authentication or different parameters."
                 )
             
+            # Normalize the filter bounds once for the whole batch
+            if use_date_range:
+                start_bound = _as_utc(start_date)
+                end_bound = _as_utc(end_date)
+            else:
+                start_bound = _as_utc(cutoff_date)
+                end_bound = None
+            
             for video_data in video_list:
-                if use_date_range:
-                    video = self._parse_video_data(
-                        video_data=video_data,
-                        cutoff_date=cutoff_date,  # Used as fallback
-                        start_date=start_date,
-                        end_date=end_date,
-                    )
-                else:
-                    video = self._parse_video_data(
-                        video_data=video_data,
-                        cutoff_date=cutoff_date,
-                    )
+                video = self._parse_video_data(
+                    video_data=video_data,
+                    start_bound=start_bound,
+                    end_bound=end_bound,
+                )
                 
                 if video:
                     videos.append(video)
@@ -137,10 +165,16 @@ class SenateScraper(BaseScraper):
         if isinstance(data, list):
             return data
         elif isinstance(data, dict):
+            if self._list_key:
+                video_list = data.get(self._list_key)
+                if isinstance(video_list, list):
+                    return video_list
             # Try common keys (order matters - check allFiles first as it's the actual key)
-            for key in ["allFiles", "items", "videos", "results", "data"]:
-                if key in data and isinstance(data[key], list):
-                    return data[key]
+            for key in ("allFiles", "items", "videos", "results", "data"):
+                video_list = data.get(key)
+                if isinstance(video_list, list):
+                    self._list_key = key
+                    return video_list
             # If no list found, return empty
             return []
         else:
@@ -149,33 +183,29 @@ class SenateScraper(BaseScraper):
     def _parse_video_data(
         self,
         video_data: Dict[str, Any],
-        cutoff_date: datetime,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
+        start_bound: datetime,
+        end_bound: Optional[datetime] = None,
     ) -> Optional[VideoMetadata]:
-        """Parse video data from API response into VideoMetadata"""
+        """Parse video data from API response (bounds must be tz-aware, see _as_utc)"""
         try:
             # Extract video ID (API uses _id)
-            video_id = video_data.get("_id") or video_data.get("id") or ""
+            video_id = _first(video_data, "_id", "id", default="")
             
             if not video_id:
                 return None
             
-            # Extract title from metadata or search
-            metadata = video_data.get("metadata", {})
-            title = (
-                metadata.get("title") if isinstance(metadata, dict) else None
-            ) or video_data.get("title") or video_data.get("name") or ""
-            
             # Extract date - API provides 'date' field in ISO format
-            date_string = video_data.get("date") or video_data.get("original_date")
+            date_string = _first(video_data, "date", "original_date")
             if date_string:
                 try:
                     # Parse ISO format date: "2025-12-23T17:01:05.730Z"
-                    from dateutil import parser as date_parser
-                    date_recorded = date_parser.parse(date_string)
-                except:
-                    date_recorded = parse_senate_date(str(date_string))
+                    # (fromisoformat accepts the trailing Z on Python 3.11+)
+                    date_recorded = datetime.fromisoformat(date_string)
+                except (ValueError, TypeError):
+                    try:
+                        date_recorded = date_parser.parse(date_string)
+                    except (ValueError, TypeError, OverflowError):
+                        date_recorded = parse_senate_date(str(date_string))
             else:
                 date_recorded = None
             
@@ -183,66 +213,30 @@ class SenateScraper(BaseScraper):
                 logger.warning(f"Could not parse date from: {date_string}")
                 return None
             
-            # Apply date filtering
-            if start_date and end_date:
-                # Date range filtering
-                # Normalize timezones for comparison - make all aware or all naive
-                from datetime import timezone
-                
-                # Normalize date_recorded
-                if date_recorded.tzinfo is None:
-                    date_to_compare = date_recorded.replace(tzinfo=timezone.utc)
-                else:
-                    date_to_compare = date_recorded
-                
-                # Normalize start_date
-                if start_date.tzinfo is None:
-                    start_date_normalized = start_date.replace(tzinfo=timezone.utc)
-                else:
-                    start_date_normalized = start_date
-                
-                # Normalize end_date
-                if end_date.tzinfo is None:
-                    end_date_normalized = end_date.replace(tzinfo=timezone.utc)
-                else:
-                    end_date_normalized = end_date
-                
-                # Filter by date range
-                if not (start_date_normalized <= date_to_compare <= end_date_normalized):
-                    return None
-            else:
-                # Cutoff date filtering (backward compatible)
-                # Normalize timezones for comparison
-                if date_recorded.tzinfo is not None and cutoff_date.tzinfo is None:
-                    # date_recorded is aware, cutoff_date is naive - make cutoff_date aware (UTC)
-                    from datetime import timezone
-                    cutoff_date_aware = cutoff_date.replace(tzinfo=timezone.utc)
-                    date_to_compare = date_recorded
-                elif date_recorded.tzinfo is None and cutoff_date.tzinfo is not None:
-                    # date_recorded is naive, cutoff_date is aware - make date_recorded aware (UTC)
-                    from datetime import timezone
-                    date_to_compare = date_recorded.replace(tzinfo=timezone.utc)
-                    cutoff_date_aware = cutoff_date
-                else:
-                    # Both same type, use as-is
-                    date_to_compare = date_recorded
-                    cutoff_date_aware = cutoff_date
-                
-                # Filter by cutoff date
-                if date_to_compare < cutoff_date_aware:
-                    return None
+            # Apply date filtering before any other extraction or the stream lookup
+            date_to_compare = _as_utc(date_recorded)
+            if date_to_compare < start_bound:
+                return None
+            if end_bound is not None and date_to_compare > end_bound:
+                return None
             
-            # Extract video URL - resolve using the pattern or API
-            stream_url = self._construct_cloudfront_url(str(video_id))
+            # Extract title from metadata or search
+            metadata = video_data.get("metadata", {})
+            title = (
+                metadata.get("title") if isinstance(metadata, dict) else None
+            ) or _first(video_data, "title", "name", default="")
+            
+            # Stream URL is resolved separately (see resolve_stream_urls) so that
+            # DiscoveryService can batch it and nothing is resolved twice
             player_url = f"https://cloud.castus.tv/vod/misenate/video/{video_id}"
             
             # Extract committee/playlist from agenda or metadata
             agenda = video_data.get("agenda", {})
             committee = None
             if isinstance(agenda, dict):
-                committee = agenda.get("name") or agenda.get("title")
+                committee = _first(agenda, "name", "title")
             if not committee and isinstance(metadata, dict):
-                committee = metadata.get("committee") or metadata.get("playlist")
+                committee = _first(metadata, "committee", "playlist")
             
             # Extract filename
             filename = f"{video_id}.mp4"
@@ -252,7 +246,6 @@ class SenateScraper(BaseScraper):
                 source="senate",
                 filename=filename,
                 url=player_url,
-                stream_url=stream_url,
                 date_recorded=date_recorded,
                 committee=committee,
                 title=title,
@@ -261,39 +254,67 @@ class SenateScraper(BaseScraper):
             logger.error(f"Error parsing video data: {e}", exc_info=True)
             return None
 
-    def resolve_stream_url(self, video: VideoMetadata) -> Optional[str]:
-        """Resolve the Senate stream URL (already handled during discovery, but added for consistency)"""
+    def resolve_stream_urls(self, videos: List[VideoMetadata], max_workers: int = 16) -> List[Optional[str]]:
+        """
+        Resolve stream URLs for many videos concurrently
+        
+        Args:
+            videos: VideoMetadata objects to resolve
+            max_workers: Maximum concurrent Castus API calls
+        
+        Returns:
+            Stream URLs in the same order as videos
+        """
+        if not videos:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(videos))) as executor:
+            return list(executor.map(self.resolve_stream_url, videos))
+
+    def resolve_stream_url(self, video: VideoMetadata, verify: bool = False) -> Optional[str]:
+        """Resolve the Senate stream URL via the Castus API (falls back to the CloudFront pattern)"""
         return self._construct_cloudfront_url(video.video_id)
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached Senate stream URLs"""
+        get_cache(STREAM_CACHE_NAME).clear()
+
     def _construct_cloudfront_url(self, video_id: str) -> str:
-        """Resolve the actual stream URL using the Castus API"""
+        """Resolve the actual stream URL using the Castus API (cached on disk)"""
+        cache = get_cache(STREAM_CACHE_NAME)
+        stream_url = cache.get(video_id)
+        if stream_url is not None:
+            return stream_url
+        
+        stream_url = self._fetch_castus_stream_url(video_id)
+        if stream_url:
+            cache.set(video_id, stream_url, expire=STREAM_CACHE_TTL)
+            return stream_url
+
+        # Fallback to the discovered pattern if API fails (not cached so the API is retried next run)
+        base_url = "https://dlttx48mxf9m3.cloudfront.net/outputs"
+        return f"{base_url}/{video_id}/Default/HLS/out.m3u8"
+
+    def _fetch_castus_stream_url(self, video_id: str) -> Optional[str]:
+        """Ask the Castus upload/get API for the stream URL (None on failure)"""
         # Primary resolution method: Call the Castus upload/get API
         # This matches the logic used by the web player
         try:
             url = "https://imd0mxanj2.execute-api.us-west-2.amazonaws.com/upload/get"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Content-Type': 'application/json',
-                'Referer': 'https://cloud.castus.tv/vod/misenate/',
-                'Origin': 'https://cloud.castus.tv'
-            }
             data = {
                 "file": video_id,
                 "type": "HLS",
                 "user": "61b3adc8124d7d000891ca5c" # Michigan Senate Org ID
             }
             
-            response = requests.post(url, headers=headers, json=data, timeout=10, verify=False)
+            response = self._session.post(url, json=data, timeout=10, verify=False)
             if response.status_code == 200:
-                res_data = response.json()
+                res_data = orjson.loads(response.content)
                 stream_url = res_data.get("response", {}).get("payload", {}).get("data")
                 if stream_url:
                     # Clean up any query parameters
                     return stream_url.split("?")[0]
         except Exception as e:
             logger.warning(f"Failed to resolve Senate stream via API: {e}")
-
-        # Fallback to the discovered pattern if API fails
-        base_url = "https://dlttx48mxf9m3.cloudfront.net/outputs"
-        return f"{base_url}/{video_id}/Default/HLS/out.m3u8"
+        return None
 
@@ -1,10 +1,12 @@
 """Video discovery service"""
 
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 from ..models import VideoMetadata
-from ..scrapers import HouseScraper, SenateScraper
+from ..scrapers import BaseScraper, HouseScraper, SenateScraper
 from ..utils import get_logger
 
 logger = get_logger(__name__)
@@ -13,6 +15,8 @@ logger = get_logger(__name__)
 class DiscoveryService:
     """Orchestrates video discovery from multiple archives"""
     
+    __slots__ = ("house_scraper", "senate_scraper")
+    
     def __init__(
         self,
         house_scraper: Optional[HouseScraper] = None,
@@ -21,8 +25,6 @@ class DiscoveryService:
         senate_api_url: Optional[str] = None,
     ):
         """Initialize discovery service"""
-        import os
-        
         # Priority: 1. Argument, 2. Env Var, 3. Hardcoded default
         h_url = house_archive_url or os.getenv("HOUSE_ARCHIVE_URL") or "https://house.mi.gov/VideoArchive"
         s_url = senate_api_url or os.getenv("SENATE_API_URL") or "https://2kbyogxrg4.execute-api.us-west-2.amazonaws.com/61b3adc8124d7d000891ca5c/home/recent"
@@ -55,6 +57,54 @@ class DiscoveryService:
         Returns:
             List of VideoMetadata objects from all sources
         """
+        all_videos = []
+        counts = {"House": 0, "Senate": 0}
+        # Collected in source order so House videos still come first
+        for name, videos in self._iter_discovered(
+            cutoff_date, cutoff_days, limit, source, resolve_streams, start_date, end_date, in_order=True
+        ):
+            all_videos.extend(videos)
+            counts[name] = len(videos)
+        
+        logger.info(
+            f"Total videos discovered: {len(all_videos)} (House: {counts['House']}, Senate: {counts['Senate']})"
+        )
+        return all_videos
+    
+    def iter_discovered_batches(
+        self,
+        cutoff_date: Optional[datetime] = None,
+        cutoff_days: int = 60,
+        limit: Optional[int] = None,
+        source: Optional[str] = None,
+        resolve_streams: bool = True,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Iterator[List[VideoMetadata]]:
+        """
+        Discover videos like discover_videos, but yield each archive's videos as soon as
+        that archive finishes so downloads can start before the slower archive is done
+        
+        Yields:
+            List of VideoMetadata objects for one source
+        """
+        for _, videos in self._iter_discovered(
+            cutoff_date, cutoff_days, limit, source, resolve_streams, start_date, end_date, in_order=False
+        ):
+            yield videos
+    
+    def _iter_discovered(
+        self,
+        cutoff_date: Optional[datetime],
+        cutoff_days: int,
+        limit: Optional[int],
+        source: Optional[str],
+        resolve_streams: bool,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        in_order: bool,
+    ) -> Iterator[Tuple[str, List[VideoMetadata]]]:
+        """Run the enabled scrapers concurrently and yield (source name, unique videos) per source"""
         # Determine date filtering approach
         if start_date and end_date:
             logger.info(f"Discovering videos between {start_date.date()} and {end_date.date()}")
@@ -65,70 +115,72 @@ class DiscoveryService:
             logger.info(f"Discovering videos after {cutoff_date.date()}")
             use_date_range = False
         
-        all_videos = []
-        house_count = 0
-        senate_count = 0
-        
-        # Discover from House archive
-        if source is None or source.lower() == "house":
-            try:
-                logger.info("Discovering from House archive...")
-                if use_date_range:
-                    house_videos = self.house_scraper.discover_videos(
-                        cutoff_date=start_date,  # Used as fallback
-                        start_date=start_date,
-                        end_date=end_date,
-                        limit=limit,
-                    )
-                else:
-                    house_videos = self.house_scraper.discover_videos(
-                        cutoff_date=cutoff_date,
-                        limit=limit,
-                    )
-                
-                if resolve_streams:
-                    logger.info(f"Resolving stream URLs for {len(house_videos)} House videos...")
-                    for video in house_videos:
-                        stream_url = self.house_scraper.resolve_stream_url(video)
-                        if stream_url:
-                            video.stream_url = stream_url
-                            
-                all_videos.extend(house_videos)
-                house_count = len(house_videos)
-                logger.info(f"Found {house_count} videos from House")
-            except Exception as e:
-                logger.error(f"Error discovering House videos: {e}", exc_info=True)
-        
-        # Discover from Senate archive
-        if source is None or source.lower() == "senate":
-            try:
-                logger.info("Discovering from Senate archive...")
-                if use_date_range:
-                    senate_videos = self.senate_scraper.discover_videos(
-                        cutoff_date=start_date,  # Used as fallback
-                        start_date=start_date,
-                        end_date=end_date,
-                        limit=limit,
-                    )
-                else:
-                    senate_videos = self.senate_scraper.discover_videos(
-                        cutoff_date=cutoff_date,
-                        limit=limit,
-                    )
-                
-                if resolve_streams:
-                    logger.info(f"Resolving stream URLs for {len(senate_videos)} Senate videos...")
-                    for video in senate_videos:
-                        stream_url = self.senate_scraper.resolve_stream_url(video)
-                        if stream_url:
-                            video.stream_url = stream_url
-                            
-                all_videos.extend(senate_videos)
-                senate_count = len(senate_videos)
-                logger.info(f"Found {senate_count} videos from Senate")
-            except Exception as e:
-                logger.error(f"Error discovering Senate videos: {e}", exc_info=True)
+        if not use_date_range:
+            start_date = end_date = None
+        scrapers = [
+            (name, scraper)
+            for name, scraper in (("House", self.house_scraper), ("Senate", self.senate_scraper))
+            if source is None or source.lower() == name.lower()
+        ]
         
-        logger.info(f"Total videos discovered: {len(all_videos)} (House: {house_count}, Senate: {senate_count})")
-        return all_videos
-
+        # Archives are independent HTTP-bound work, so query them at the same time
+        seen = set()  # (source, video_id) - a feed can list the same video more than once
+        with ThreadPoolExecutor(max_workers=max(1, len(scrapers))) as executor:
+            futures = {
+                executor.submit(
+                    self._discover_from_source,
+                    name,
+                    scraper,
+                    cutoff_date=start_date or cutoff_date,  # Used as fallback with a date range
+                    limit=limit,
+                    resolve_streams=resolve_streams,
+                    start_date=start_date,
+                    end_date=end_date,
+                ): name
+                for name, scraper in scrapers
+            }
+            for future in (futures if in_order else as_completed(futures)):
+                name = futures[future]
+                videos = future.result()
+                unique = []
+                for video in videos:
+                    key = (video.source, video.video_id)
+                    if key not in seen:
+                        seen.add(key)
+                        unique.append(video)
+                if len(unique) < len(videos):
+                    logger.info(f"Dropped {len(videos) - len(unique)} duplicate {name} videos")
+                yield name, unique
+    
+    def _discover_from_source(
+        self,
+        name: str,
+        scraper: BaseScraper,
+        cutoff_date: datetime,
+        limit: Optional[int],
+        resolve_streams: bool,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[VideoMetadata]:
+        """Discover (and optionally resolve) videos from one archive; errors yield an empty list"""
+        try:
+            logger.info(f"Discovering from {name} archive...")
+            videos = scraper.discover_videos(
+                cutoff_date=cutoff_date,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+            )
+            
+            if resolve_streams:
+                logger.info(f"Resolving stream URLs for {len(videos)} {name} videos...")
+                stream_urls = scraper.resolve_stream_urls(videos)
+                for video, stream_url in zip(videos, stream_urls):
+                    if stream_url:
+                        video.stream_url = stream_url
+            
+            logger.info(f"Found {len(videos)} videos from {name}")
+            return videos
+        except Exception as e:
+            logger.error(f"Error discovering {name} videos: {e}", exc_info=True)
+            return []
@@ -1,15 +1,26 @@
 """Video download service"""
 
+import asyncio
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
 
 from ..models import VideoMetadata, ProcessingStatus, DownloadStatus, DownloadResult
 from ..downloaders import VideoDownloader, BlobHandler
+from ..scrapers import BaseScraper, HouseScraper, SenateScraper
 from ..services.state_service import StateService
 from ..utils import get_logger
 
 logger = get_logger(__name__)
 
+# Characters not allowed in filenames on common filesystems
+_INVALID_FILENAME_CHARS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+_SAFE_FILENAME_RE = re.compile(r'[\w.\-]+')
+
 
 class DownloadService:
     """Manages video downloads with state tracking"""
@@ -21,15 +32,39 @@ class DownloadService:
         max_retries: int = 3,
         timeout: int = 300,
         use_blob_handler: bool = False,
+        scrapers: Optional[dict[str, BaseScraper]] = None,
+        chunk_size: int = 1024 * 1024,
     ):
-        """Initialize download service"""
+        """Initialize download service (scrapers maps source -> scraper, created on demand if omitted)"""
         self.state_service = state_service
         self.output_directory = Path(output_directory)
+        # One connection pool for every download and probe made by this service
+        # (sized for concurrent batches, see download_videos_async)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         self.downloader = VideoDownloader(
             max_retries=max_retries,
             timeout=timeout,
+            chunk_size=chunk_size,
+            session=self._session,
         )
-        self.blob_handler = BlobHandler(use_browser=use_blob_handler)
+        self.blob_handler = BlobHandler(use_browser=use_blob_handler, session=self._session)
+        self._scrapers: dict[str, BaseScraper] = dict(scrapers or {})
+        # (source, video_id) -> stream URL resolved by this service
+        self._stream_urls: dict[tuple[str, str], str] = {}
+    
+    def close(self) -> None:
+        """Release the browser and pooled HTTP connections"""
+        self.blob_handler.cleanup()
+        self._session.close()
+    
+    def __enter__(self) -> "DownloadService":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def download_video(
         self,
@@ -45,24 +80,27 @@ class DownloadService:
             DownloadResult with success status
         """
         # Check if already downloaded
-        if self.state_service.is_video_processed(video.video_id, video.source):
-            existing_path = self.state_service.get_download_path(video.video_id, video.source)
-            if existing_path and existing_path.exists():
-                return DownloadResult(
-                    success=True,
-                    video_id=video.video_id,
-                    file_path=existing_path,
-                )
+        existing_path = self.state_service.get_processed_path(video.video_id, video.source)
+        if existing_path and existing_path.exists():
+            return DownloadResult(
+                success=True,
+                video_id=video.video_id,
+                file_path=existing_path,
+            )
         
         # Mark as in progress
         status = ProcessingStatus(download_status=DownloadStatus.IN_PROGRESS)
         self.state_service.mark_video_processed(video, status)
         
-        print(f"📥 Downloading: {video.video_id} ({video.source})")
+        logger.info(f"Downloading: {video.video_id} ({video.source})")
         
         try:
             # Determine best URL to use for download
             # If stream_url is already resolved, use it directly (Turbo mode)
+            if not video.stream_url:
+                # Reuse a URL resolved earlier in this process (callers pass the stored one in)
+                video.stream_url = self._known_stream_url(video)
+            
             if video.stream_url:
                 video_url = video.stream_url
                 logger.info(f"[DOWNLOAD_SERVICE] Using already resolved stream URL: {video_url}")
@@ -73,6 +111,7 @@ class DownloadService:
                 
                 if video.stream_url:
                     video_url = video.stream_url
+                    self._stream_urls[(video.source, video.video_id)] = video_url
                     logger.info(f"[DOWNLOAD_SERVICE] Resolved stream URL: {video_url}")
                     # Update stream URL in database
                     self.state_service.db.update_stream_url(video.video_id, video.source, video.stream_url)
@@ -112,11 +151,11 @@ class DownloadService:
                     download_path=result.file_path,
                 )
                 file_size_mb = result.bytes_downloaded / (1024 * 1024)
-                print(f"✅ Success: {video.video_id} ({file_size_mb:.1f} MB)")
+                logger.info(f"Download succeeded: {video.video_id} ({file_size_mb:.1f} MB)")
             else:
                 status = ProcessingStatus(download_status=DownloadStatus.FAILED)
                 self.state_service.mark_video_processed(video, status)
-                print(f"❌ Failed: {video.video_id} - {result.error_message}")
+                logger.warning(f"Download failed: {video.video_id} - {result.error_message}")
             
             return result
             
@@ -131,26 +170,36 @@ class DownloadService:
                 error_message=str(e),
             )
     
+    def _known_stream_url(self, video: VideoMetadata) -> Optional[str]:
+        """Return a stream URL resolved earlier by this service, if any
+
+        The stored URL is expected on the VideoMetadata already (download_video_task
+        builds it from the record it loaded), so this does not query the database.
+        """
+        return self._stream_urls.get((video.source, video.video_id))
+    
     def _resolve_stream_url(self, video: VideoMetadata) -> Optional[str]:
         """Resolve stream URL using appropriate scraper"""
         try:
-            if video.source == "house":
-                from ..scrapers import HouseScraper
-                scraper = HouseScraper()
-                stream_url = scraper.resolve_stream_url(video)
-                return stream_url
-            elif video.source == "senate":
-                from ..scrapers import SenateScraper
-                scraper = SenateScraper()
-                stream_url = scraper.resolve_stream_url(video)
-                return stream_url
-            else:
+            scraper = self._scraper_for(video.source)
+            if scraper is None:
                 logger.warning(f"[DOWNLOAD_SERVICE] Unknown source: {video.source}, cannot resolve stream URL")
                 return None
+            return scraper.resolve_stream_url(video)
         except Exception as e:
             logger.error(f"[DOWNLOAD_SERVICE] Error resolving stream URL for {video.video_id}: {e}", exc_info=True)
             return None
     
+    def _scraper_for(self, source: str) -> Optional[BaseScraper]:
+        """Get the scraper for a source, creating it once per service"""
+        scraper = self._scrapers.get(source)
+        if scraper is None:
+            scraper_class = {"house": HouseScraper, "senate": SenateScraper}.get(source)
+            if scraper_class is None:
+                return None
+            scraper = self._scrapers.setdefault(source, scraper_class())
+        return scraper
+    
     def _generate_filename(self, video: VideoMetadata) -> str:
         """Generate safe filename for video"""
         # Use video_id as base, ensure .mp4 extension
@@ -158,20 +207,72 @@ class DownloadService:
         if not base_name.endswith(".mp4"):
             base_name = f"{base_name}.mp4"
         
-        # Sanitize filename (remove invalid characters)
-        import re
-        base_name = re.sub(r'[<>:"/\\|?*]', '_', base_name)
+        # Most IDs are already alphanumeric/dashes and need no sanitizing
+        if _SAFE_FILENAME_RE.fullmatch(base_name):
+            return base_name
         
-        return base_name
+        # Sanitize filename (replace invalid characters)
+        return base_name.translate(_INVALID_FILENAME_CHARS)
     
     def download_videos(
         self,
-        videos: list[VideoMetadata],
+        videos: Iterable[VideoMetadata],
+        concurrency: int = 8,
     ) -> list[DownloadResult]:
-        """Download multiple videos"""
+        """Download multiple videos (up to concurrency at a time)"""
+        return asyncio.run(self.download_videos_async(videos, concurrency=concurrency))
+    
+    async def download_videos_async(
+        self,
+        videos: Iterable[VideoMetadata],
+        concurrency: int = 8,
+    ) -> list[DownloadResult]:
+        """
+        Download multiple videos concurrently
+        
+        Each download_video call runs in a worker thread; a semaphore bounds how
+        many are in flight so bandwidth and the database are not overwhelmed.
+        
+        Args:
+            videos: Videos to download
+            concurrency: Maximum simultaneous downloads
+        
+        Returns:
+            DownloadResults in the same order as videos
+        """
+        videos = list(videos)
+        semaphore = asyncio.Semaphore(concurrency)
+        # Batch progress is only touched from the event loop, so worker threads
+        # never contend on the console
+        progress = tqdm(total=len(videos), unit="vid", desc="Downloading videos")
+        
+        async def download_one(video: VideoMetadata) -> DownloadResult:
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(self.download_video, video)
+                finally:
+                    progress.set_postfix_str(video.video_id)
+                    progress.update(1)
+        
+        try:
+            outcomes = await asyncio.gather(
+                *(download_one(video) for video in videos),
+                return_exceptions=True,
+            )
+        finally:
+            progress.close()
+            # Close the browser shared across the batch (no-op if never launched)
+            await asyncio.to_thread(self.blob_handler.cleanup)
+        
         results = []
-        for video in videos:
-            result = self.download_video(video)
-            results.append(result)
+        for video, outcome in zip(videos, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Error downloading video {video.video_id}: {outcome}")
+                outcome = DownloadResult(
+                    success=False,
+                    video_id=video.video_id,
+                    error_message=str(outcome),
+                )
+            results.append(outcome)
         return results
 
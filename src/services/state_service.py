@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from ..database import DatabaseManager
 from ..models import VideoMetadata, ProcessingStatus, DownloadStatus
@@ -23,6 +23,13 @@ class StateService:
             return Path(record.download_path)
         return None
     
+    def get_processed_path(self, video_id: str, source: str) -> Optional[Path]:
+        """Get download path for a video only if it is marked downloaded (single query)"""
+        record = self.db.get_video_record(video_id, source)
+        if record and record.download_status == "downloaded" and record.download_path:
+            return Path(record.download_path)
+        return None
+    
     def is_video_processed(self, video_id: str, source: str) -> bool:
         """Check if video has been processed (downloaded)"""
         record = self.db.get_video_record(video_id, source)
@@ -52,6 +59,13 @@ class StateService:
                 stream_url=video.stream_url,
             )
     
+    def mark_videos_discovered(self, videos: List[VideoMetadata]) -> List[VideoMetadata]:
+        """Mark many videos as discovered in a single transaction; returns the newly added ones"""
+        if not videos:
+            return []
+        new_ids = set(self.db.create_video_records([video.to_dict() for video in videos]))
+        return [video for video in videos if video.video_id in new_ids]
+    
     def mark_video_processed(
         self,
         video: VideoMetadata,
@@ -72,52 +86,35 @@ class StateService:
         self,
         cutoff_date: Optional[datetime] = None,
         source: Optional[str] = None,
-    ) -> List[VideoMetadata]:
-        """Get list of videos that haven't been downloaded"""
-        records = self.db.get_unprocessed_videos(
+    ) -> Iterator[VideoMetadata]:
+        """Yield videos that haven't been downloaded"""
+        records = self.db.iter_videos(
             cutoff_date=cutoff_date,
             download_status="pending",
             source=source,
         )
-        
-        videos = []
         for record in records:
-            video = VideoMetadata(
-                video_id=record.id,
-                source=record.source,
-                filename=record.filename,
-                url=record.url,
-                stream_url=record.stream_url,
-                date_recorded=record.date_recorded,
-                committee=record.committee,
-                title=record.title,
-                date_discovered=record.date_discovered,
-            )
-            videos.append(video)
-        
-        return videos
+            yield _to_video_metadata(record)
     
     def get_all_videos(
         self,
         cutoff_date: Optional[datetime] = None,
-    ) -> List[VideoMetadata]:
-        """Get all videos, optionally filtered by date"""
-        records = self.db.get_all_videos(cutoff_date=cutoff_date)
-        
-        videos = []
-        for record in records:
-            video = VideoMetadata(
-                video_id=record.id,
-                source=record.source,
-                filename=record.filename,
-                url=record.url,
-                stream_url=record.stream_url,
-                date_recorded=record.date_recorded,
-                committee=record.committee,
-                title=record.title,
-                date_discovered=record.date_discovered,
-            )
-            videos.append(video)
-        
-        return videos
+    ) -> Iterator[VideoMetadata]:
+        """Yield all videos (newest first), optionally filtered by date"""
+        for record in self.db.iter_videos(cutoff_date=cutoff_date, newest_first=True):
+            yield _to_video_metadata(record)
+
 
+def _to_video_metadata(record) -> VideoMetadata:
+    """Build VideoMetadata from a VideoRecord row"""
+    return VideoMetadata(
+        video_id=record.id,
+        source=record.source,
+        filename=record.filename,
+        url=record.url,
+        stream_url=record.stream_url,
+        date_recorded=record.date_recorded,
+        committee=record.committee,
+        title=record.title,
+        date_discovered=record.date_discovered,
+    )
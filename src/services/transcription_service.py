@@ -1,56 +1,231 @@
+import asyncio
+import hashlib
+import mimetypes
 import os
+import tempfile
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from datetime import timedelta
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 
-import whisper
-from openai import OpenAI
-import google.generativeai as genai
+import numpy as np
+import orjson
 
+from ..utils.audio_extractor import compress_audio, load_audio_array, probe_duration, split_audio
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__, service_name="transcription-service")
 
+WHISPER_PROMPT = "A verbatim transcription of a legislative session. Maintain all filler words and formal language."
+GEMINI_PROMPT = "Provide a verbatim transcription of this audio file following the system instructions."
+
+# OpenAI rejects uploads over 25 MB; audio that is too large or longer than one chunk is split
+# into chunks of this many seconds (10 minutes of 16 kHz mono PCM is ~19 MB) and the chunks
+# are transcribed concurrently, with a short stagger between submissions to ease rate limits
+OPENAI_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+OPENAI_CHUNK_SECONDS = 600
+OPENAI_CHUNK_CONCURRENCY = int(os.getenv("OPENAI_WHISPER_CONCURRENCY", "4"))
+OPENAI_SUBMIT_STAGGER_SECONDS = 0.05
+
+# Gemini file processing is polled starting fast (short clips finish quickly) and backing off
+GEMINI_POLL_INITIAL_SECONDS = 0.25
+GEMINI_POLL_MAX_SECONDS = 4.0
+
+# Gemini files uploaded by this process, by audio sha256 -> file name, so re-runs skip the upload;
+# also shared across workers in Redis for slightly less than Gemini's 48h file lifetime
+_GEMINI_UPLOADS: Dict[str, str] = {}
+GEMINI_UPLOAD_TTL = 47 * 3600
+
+# The SDK logs every request at debug level, which adds up across chunks
+os.environ.setdefault("OPENAI_LOG", "warn")
+
+# Finished transcripts are cached in Redis by audio content hash so re-runs/retries of the
+# same audio skip decoding or API calls entirely
+TRANSCRIPT_CACHE_TTL = int(os.getenv("TRANSCRIPT_CACHE_TTL", str(30 * 24 * 3600)))
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Inputs the local provider decodes itself rather than expecting extracted audio
+VIDEO_SUFFIXES = {".mp4", ".mkv", ".mov"}
+
+# WHISPER_BACKEND selects the local implementation, optionally pinning device and precision:
+#   ref, ref_cpu, ref_gpu             - reference openai-whisper (PyTorch), e.g. for comparison
+#   ct2, ct2_cpu_int8, ct2_gpu_fp16   - faster-whisper (CTranslate2), used whenever installed
+# WHISPER_DEVICE / WHISPER_FP16 / FW_COMPUTE_TYPE override what the backend name implies
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "ct2")
+_BACKEND_DEVICES = {"cpu": "cpu", "gpu": "cuda"}
+_BACKEND_COMPUTE_TYPES = {"int8": "int8", "fp16": "float16", "fp32": "float32"}
+FW_COMPUTE_TYPE = os.getenv("FW_COMPUTE_TYPE")
+FW_BEAM_SIZE = int(os.getenv("FW_BEAM_SIZE", "1"))
+# faster-whisper decodes VAD-detected speech chunks in batches of this size
+FW_BATCH_SIZE = int(os.getenv("FW_BATCH", "16"))
+
+# ML SDKs (torch via whisper, CTranslate2, OpenAI, Gemini) are imported only by the provider
+# that needs them, so a worker running one provider doesn't pay for loading the others
+
+@lru_cache(maxsize=1)
+def _faster_whisper_installed() -> bool:
+    """CTranslate2 re-implementation of Whisper (GPU FP16 / CPU int8); optional"""
+    try:
+        import faster_whisper  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _backend_option(options: Dict[str, str]) -> Optional[str]:
+    """Device/precision implied by the WHISPER_BACKEND suffixes, if any"""
+    for part in WHISPER_BACKEND.lower().split("_")[1:]:
+        if part in options:
+            return options[part]
+    return None
+
+def _use_faster_whisper() -> bool:
+    return not WHISPER_BACKEND.lower().startswith("ref") and _faster_whisper_installed()
+
+def _resolve_device(device: Optional[str] = None) -> str:
+    """Explicit device, then WHISPER_DEVICE, then the backend name, then auto-detection"""
+    return device or os.getenv("WHISPER_DEVICE") or _backend_option(_BACKEND_DEVICES) or _default_device()
+
+def _default_device() -> str:
+    """Pick CUDA when a GPU is visible, otherwise CPU"""
+    if _faster_whisper_installed():
+        import ctranslate2
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    import torch  # Installed with openai-whisper
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+@lru_cache(maxsize=4)
+def _load_whisper_model(model_name: str, device: str):
+    """
+    Load a Whisper model, preferring faster-whisper (FP16 on CUDA, int8 on CPU)
+    
+    Models are cached per process by (model_name, device) since loading takes
+    seconds and hundreds of MB that are not reclaimed promptly.
+    """
+    logger.info(f"Loading local Whisper model: {model_name} ({device})")
+    if not _use_faster_whisper():
+        import whisper
+        return whisper.load_model(model_name, device=device)
+    from faster_whisper import WhisperModel
+    compute_type = (
+        FW_COMPUTE_TYPE
+        or _backend_option(_BACKEND_COMPUTE_TYPES)
+        or ("float16" if device == "cuda" else "int8")
+    )
+    return WhisperModel(model_name, device=device, compute_type=compute_type)
+
+@lru_cache(maxsize=4)
+def _gemini_model(model_name: str, system_instruction: str):
+    """GenerativeModel shared by every Gemini provider in the process with the same settings"""
+    import google.generativeai as genai
+    return genai.GenerativeModel(model_name=model_name, system_instruction=system_instruction)
+
+def _file_sha256(path) -> str:
+    """SHA-256 of a file's contents, hashed without reading it into memory"""
+    with open(path, "rb", buffering=HASH_CHUNK_SIZE) as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def _poll_delays(initial: float = GEMINI_POLL_INITIAL_SECONDS, maximum: float = GEMINI_POLL_MAX_SECONDS):
+    """Exponential backoff intervals for polling Gemini file processing"""
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * 1.5, maximum)
+
+def _segment_field(segment: Any, key: str, default: Any = None) -> Any:
+    """Read a field from a segment returned either as a dict or as an SDK object"""
+    if isinstance(segment, dict):
+        return segment.get(key, default)
+    return getattr(segment, key, default)
+
+_TIMESTAMP_FORMAT = "[{:02d}:{:02d}:{:02d}]"
+
 def format_timestamp(seconds: float) -> str:
     """Convert seconds to [HH:MM:SS] format"""
-    td = timedelta(seconds=int(seconds))
     # Ensure HH:MM:SS format even for durations > 24h or < 1h
-    hours, remainder = divmod(int(seconds), 3600)
-    minutes, secs = divmod(remainder, 60)
-    return f"[{hours:02d}:{minutes:02d}:{secs:02d}]"
+    h, rem = divmod(int(seconds), 3600)
+    m, sec = divmod(rem, 60)
+    return _TIMESTAMP_FORMAT.format(h, m, sec)
+
+def _segment_start_text(segment: Any) -> Tuple[float, str]:
+    """A segment's start offset and stripped text"""
+    return _segment_field(segment, 'start') or 0, (_segment_field(segment, 'text') or "").strip()
+
+def _transcript_line(timestamp: str, text: str) -> str:
+    """The "[HH:MM:SS] **Speaker:** text" layout shared by every transcript writer"""
+    return f"{timestamp} **Speaker:** {text}"
+
+def format_segment_line(segment: Any) -> str:
+    """Render one segment as a transcript line"""
+    start, text = _segment_start_text(segment)
+    return _transcript_line(format_timestamp(start), text)
+
+def format_segments(segments: List[Any]) -> str:
+    """Render segments as transcript lines (timestamps computed in one NumPy pass)"""
+    if not segments:
+        return ""
+    fields = [_segment_start_text(segment) for segment in segments]
+    seconds = np.fromiter((start for start, _ in fields), dtype=np.float64, count=len(fields)).astype(np.int64)
+    hours = (seconds // 3600).tolist()
+    minutes = (seconds % 3600 // 60).tolist()
+    secs = (seconds % 60).tolist()
+    return "\n".join(
+        _transcript_line(_TIMESTAMP_FORMAT.format(h, m, sec), text)
+        for h, m, sec, (_, text) in zip(hours, minutes, secs, fields)
+    )
+
+def iter_result_lines(result: Dict[str, Any]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """(line, segment) pairs for a finished result; results without segments are one block of text"""
+    segments = result.get("segments")
+    if not segments:
+        yield result["text"], None
+        return
+    for segment in segments:
+        if not isinstance(segment, dict):
+            segment = {
+                "start": _segment_field(segment, 'start') or 0,
+                "end": _segment_field(segment, 'end') or 0,
+                "text": _segment_field(segment, 'text') or "",
+            }
+        yield format_segment_line(segment), segment
 
 class TranscriptionProvider(ABC):
     @abstractmethod
     def transcribe(self, audio_path: Path) -> Dict[str, Any]:
         pass
 
+    def transcribe_stream(self, audio_path: Path) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Yield (transcript line, segment) pairs so callers can write them out as they arrive
+        
+        Providers that decode incrementally override this; the default transcribes fully first.
+        """
+        yield from iter_result_lines(self.transcribe(audio_path))
+
 class LocalWhisperProvider(TranscriptionProvider):
-    def __init__(self, model_name: str = "base"):
-        logger.info(f"Loading local Whisper model: {model_name}")
-        self.model = whisper.load_model(model_name)
+    provider_name = "local_whisper"
+
+    def __init__(self, model_name: str = "base", device: Optional[str] = None, fp16: Optional[bool] = None):
+        self.model_name = model_name
+        self.device = _resolve_device(device)
+        self.model = _load_whisper_model(model_name, self.device)
+        self.faster_whisper = _use_faster_whisper()
+        self.pipeline = None
+        if self.faster_whisper:
+            from faster_whisper import BatchedInferencePipeline
+            self.pipeline = BatchedInferencePipeline(model=self.model)
+        if fp16 is None:
+            fp16_env = os.getenv("WHISPER_FP16")
+            fp16 = fp16_env.lower() in ("1", "true", "yes") if fp16_env else self.device == "cuda"
+        # Reference backend only; CTranslate2 precision is set by its compute type
+        self.fp16 = fp16
 
     def transcribe(self, audio_path: Path) -> Dict[str, Any]:
-        logger.info(f"Local Whisper starting transcription for: {audio_path}")
         start_time = time.time()
+        segments = list(self._iter_segments(audio_path))
         
-        # This is the 'heavy' part that takes time
-        result = self.model.transcribe(
-            str(audio_path),
-            initial_prompt="A verbatim transcription of a legislative session. Maintain all filler words and formal language."
-        )
-        
-        segments = result.get("segments", [])
-        formatted_lines = []
-        
-        for segment in segments:
-            start = segment.get('start', 0)
-            text = segment.get('text', "")
-            ts = format_timestamp(start)
-            formatted_lines.append(f"{ts} **Speaker:** {text.strip()}")
-            
-        full_text = "\n".join(formatted_lines)
+        full_text = format_segments(segments)
         duration = time.time() - start_time
         logger.info(f"Local Whisper finished transcription in {duration:.2f} seconds")
         
@@ -58,38 +233,58 @@ class LocalWhisperProvider(TranscriptionProvider):
             "text": full_text,
             "segments": segments,
             "duration": duration,
-            "provider": "local_whisper"
+            "provider": self.provider_name
         }
 
+    def transcribe_stream(self, audio_path: Path) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        start_time = time.time()
+        for segment in self._iter_segments(audio_path):
+            yield format_segment_line(segment), segment
+        logger.info(f"Local Whisper finished transcription in {time.time() - start_time:.2f} seconds")
+
+    def _iter_segments(self, audio_path: Path) -> Iterator[Dict[str, Any]]:
+        """Decode audio into segment dicts (lazily with faster-whisper)"""
+        audio_path = os.fspath(audio_path)
+        logger.info(f"Local Whisper starting transcription for: {audio_path}")
+        
+        # Video inputs are decoded straight into memory through an FFmpeg pipe
+        # instead of round-tripping through an extracted WAV on disk
+        audio = load_audio_array(audio_path) if Path(audio_path).suffix.lower() in VIDEO_SUFFIXES else audio_path
+        
+        # This is the 'heavy' part that takes time
+        if self.faster_whisper:
+            segments_iter, _ = self.pipeline.transcribe(
+                audio,
+                batch_size=FW_BATCH_SIZE,
+                beam_size=FW_BEAM_SIZE,
+                vad_filter=True,
+                initial_prompt=WHISPER_PROMPT,
+            )
+            # Decoding is lazy; yield the same segment dicts openai-whisper returns
+            for segment in segments_iter:
+                yield {"id": segment.id, "start": segment.start, "end": segment.end, "text": segment.text}
+        else:
+            result = self.model.transcribe(audio, initial_prompt=WHISPER_PROMPT, fp16=self.fp16)
+            yield from result.get("segments", [])
+
 class OpenAIWhisperProvider(TranscriptionProvider):
+    provider_name = "openai_whisper"
+
     def __init__(self, api_key: Optional[str] = None):
+        from openai import OpenAI
         self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.model_name = "whisper-1"
 
     def transcribe(self, audio_path: Path) -> Dict[str, Any]:
         start_time = time.time()
         logger.info(f"OpenAI Whisper starting transcription for: {audio_path}")
         
-        with open(audio_path, "rb") as audio_file:
-            response = self.client.audio.transcriptions.create(
-                model="whisper-1", 
-                file=audio_file,
-                response_format="verbose_json",
-                prompt="A verbatim transcription of a legislative session. Maintain all filler words and formal language."
-            )
+        if self._needs_chunking(audio_path):
+            segments = self._transcribe_chunked(audio_path)
+        else:
+            segments = self._transcribe_file(audio_path)
         
-        # verbose_json returns segments. We map them to our unified format.
-        segments = getattr(response, 'segments', [])
-        formatted_lines = []
-        
-        for segment in segments:
-            # handle both dict and object access
-            start = segment.get('start') if isinstance(segment, dict) else getattr(segment, 'start', 0)
-            text = segment.get('text') if isinstance(segment, dict) else getattr(segment, 'text', "")
-            
-            ts = format_timestamp(start)
-            formatted_lines.append(f"{ts} **Speaker:** {text.strip()}")
-            
-        full_text = "\n".join(formatted_lines)
+        full_text = format_segments(segments)
         duration = time.time() - start_time
         logger.info(f"OpenAI Whisper finished transcription in {duration:.2f} seconds")
 
@@ -97,13 +292,67 @@ class OpenAIWhisperProvider(TranscriptionProvider):
             "text": full_text,
             "segments": segments,
             "duration": duration,
-            "provider": "openai_whisper"
+            "provider": self.provider_name
         }
 
+    def _needs_chunking(self, audio_path) -> bool:
+        """Chunk when the file is over the upload limit or long enough to benefit from parallel chunks"""
+        if os.path.getsize(audio_path) > OPENAI_MAX_UPLOAD_BYTES:
+            return True
+        duration = probe_duration(os.fspath(audio_path))
+        return duration is not None and duration > OPENAI_CHUNK_SECONDS
+
+    def _transcribe_file(self, audio_path) -> List[Any]:
+        """Transcribe one file that fits in a single upload; returns verbose_json segments"""
+        # Large buffer keeps read syscalls low while the SDK streams the upload
+        filename = os.path.basename(audio_path)
+        mimetype = mimetypes.guess_type(filename)[0] or "audio/wav"
+        with open(audio_path, "rb", buffering=1024 * 1024) as audio_file:
+            response = self.client.audio.transcriptions.create(
+                model=self.model_name,
+                file=(filename, audio_file, mimetype),
+                response_format="verbose_json",
+                prompt=WHISPER_PROMPT
+            )
+        return getattr(response, 'segments', None) or []
+
+    def _transcribe_chunked(self, audio_path) -> List[Dict[str, Any]]:
+        """Split audio into fixed-length chunks, transcribe them concurrently and stitch the segments"""
+        with tempfile.TemporaryDirectory(prefix="openai_chunks_") as chunk_dir:
+            audio_path = os.fspath(audio_path)
+            # Uploads are bandwidth-bound, so send large PCM files as Opus (~6x smaller)
+            if os.path.getsize(audio_path) > OPENAI_MAX_UPLOAD_BYTES:
+                audio_path = compress_audio(audio_path, chunk_dir) or audio_path
+            chunk_paths = split_audio(audio_path, OPENAI_CHUNK_SECONDS, chunk_dir)
+            if not chunk_paths:
+                raise RuntimeError(f"Could not split {audio_path} into upload-sized chunks")
+            logger.info(f"Transcribing {len(chunk_paths)} chunks of {audio_path} with OpenAI Whisper")
+            
+            with ThreadPoolExecutor(max_workers=OPENAI_CHUNK_CONCURRENCY) as executor:
+                futures = []
+                for chunk_path in chunk_paths:
+                    futures.append(executor.submit(self._transcribe_file, chunk_path))
+                    time.sleep(OPENAI_SUBMIT_STAGGER_SECONDS)
+                chunk_segments = [future.result() for future in futures]
+        
+        # Shift each chunk's timestamps by its position in the original audio
+        segments = []
+        for index, chunk in enumerate(chunk_segments):
+            offset = index * OPENAI_CHUNK_SECONDS
+            for segment in chunk:
+                segments.append({
+                    "start": (_segment_field(segment, 'start') or 0) + offset,
+                    "end": (_segment_field(segment, 'end') or 0) + offset,
+                    "text": _segment_field(segment, 'text') or "",
+                })
+        return segments
+
 class GeminiTranscriptionProvider(TranscriptionProvider):
     def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None):
         # Use provided model_name or fallback to env or hard default
         self.model_name = model_name or os.getenv("GEMINI_MODEL", "gemini-3-flash-preview")
+        import google.generativeai as genai
+        self._genai = genai
         genai.configure(api_key=api_key or os.getenv("GOOGLE_API_KEY"))
         
         # Standardize: Ensure the model string doesn't have the 'models/' prefix
@@ -131,38 +380,217 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
         8. Describe non-speech events in brackets: [HH:MM:SS] [Gavel strikes], [HH:MM:SS] [Ambient noise].
         9. DO NOT summarize. DO NOT omit filler words if they are part of the formal record.
         """
+        self.model = _gemini_model(self.model_name, self.system_instruction)
+
+        import redis
+        self._redis = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        self._redis_error = redis.RedisError
 
     def transcribe(self, audio_path: Path) -> Dict[str, Any]:
         start_time = time.time()
-        model = genai.GenerativeModel(
-            model_name=self.model_name,
-            system_instruction=self.system_instruction
-        )
         
-        # Upload the file to Gemini
-        logger.info(f"Uploading {audio_path} to Gemini {self.model_name}...")
-        audio_file = genai.upload_file(path=str(audio_path))
+        audio_path = os.fspath(audio_path)
+        digest = _file_sha256(audio_path)
+        audio_file = self._get_uploaded_file(digest)
+        if audio_file is None:
+            # Upload the file to Gemini
+            logger.info(f"Uploading {audio_path} to Gemini {self.model_name}...")
+            audio_file = self._genai.upload_file(path=audio_path)
+            
+            # Wait for processing
+            delays = _poll_delays()
+            while audio_file.state.name == "PROCESSING":
+                time.sleep(next(delays))
+                audio_file = self._genai.get_file(audio_file.name)
+                
+            if audio_file.state.name == "FAILED":
+                raise Exception("Gemini audio processing failed")
+            self._remember_upload(digest, audio_file.name)
+
+        response = self.model.generate_content([GEMINI_PROMPT, audio_file])
+        return self._build_result(response, start_time)
+
+    async def transcribe_async(self, audio_path: Path) -> Dict[str, Any]:
+        """Async transcribe: blocking SDK calls run in threads and polling yields to the event loop"""
+        start_time = time.time()
         
-        # Wait for processing
-        while audio_file.state.name == "PROCESSING":
-            time.sleep(2)
-            audio_file = genai.get_file(audio_file.name)
+        audio_path = os.fspath(audio_path)
+        digest = await asyncio.to_thread(_file_sha256, audio_path)
+        audio_file = await asyncio.to_thread(self._get_uploaded_file, digest)
+        if audio_file is None:
+            logger.info(f"Uploading {audio_path} to Gemini {self.model_name}...")
+            audio_file = await asyncio.to_thread(self._genai.upload_file, path=audio_path)
             
-        if audio_file.state.name == "FAILED":
-            raise Exception("Gemini audio processing failed")
+            delays = _poll_delays()
+            while audio_file.state.name == "PROCESSING":
+                await asyncio.sleep(next(delays))
+                audio_file = await asyncio.to_thread(self._genai.get_file, audio_file.name)
+                
+            if audio_file.state.name == "FAILED":
+                raise Exception("Gemini audio processing failed")
+            await asyncio.to_thread(self._remember_upload, digest, audio_file.name)
+
+        response = await asyncio.to_thread(self.model.generate_content, [GEMINI_PROMPT, audio_file])
+        return self._build_result(response, start_time)
 
-        prompt = "Provide a verbatim transcription of this audio file following the system instructions."
-        response = model.generate_content([prompt, audio_file])
+    async def transcribe_many(self, audio_paths: List[Path], concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Transcribe several files with overlapping uploads/processing (at most concurrency at once)"""
+        semaphore = asyncio.Semaphore(concurrency)
         
+        async def transcribe_one(audio_path: Path) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.transcribe_async(audio_path)
+        
+        return await asyncio.gather(*(transcribe_one(path) for path in audio_paths))
+
+    def reconfigure(self, api_key: str):
+        """Switch to a new API key (e.g. after rotation) and rebuild the model"""
+        self._genai.configure(api_key=api_key)
+        _gemini_model.cache_clear()
+        self.model = _gemini_model(self.model_name, self.system_instruction)
+
+    @property
+    def provider_name(self) -> str:
+        return f"gemini_3.0_{self.model_name}"
+
+    def _get_uploaded_file(self, digest: str):
+        """Return a still-active Gemini file previously uploaded for this audio, if any"""
+        name = _GEMINI_UPLOADS.get(digest)
+        if name is None:
+            try:
+                stored = self._redis.get(f"gemini:file:{digest}")
+            except self._redis_error:
+                stored = None
+            if stored is None:
+                return None
+            name = stored.decode()
+        try:
+            audio_file = self._genai.get_file(name)
+        except Exception as e:
+            logger.info(f"Previously uploaded Gemini file {name} is gone, re-uploading: {e}")
+            self._forget_upload(digest)
+            return None
+        if audio_file.state.name != "ACTIVE":
+            self._forget_upload(digest)
+            return None
+        logger.info(f"Reusing uploaded Gemini file {name}")
+        _GEMINI_UPLOADS[digest] = name
+        return audio_file
+
+    def _remember_upload(self, digest: str, name: str):
+        _GEMINI_UPLOADS[digest] = name
+        try:
+            self._redis.setex(f"gemini:file:{digest}", GEMINI_UPLOAD_TTL, name)
+        except self._redis_error as e:
+            logger.warning(f"Could not record Gemini upload {name} in Redis: {e}")
+
+    def _forget_upload(self, digest: str):
+        _GEMINI_UPLOADS.pop(digest, None)
+        try:
+            self._redis.delete(f"gemini:file:{digest}")
+        except self._redis_error:
+            pass
+
+    def _build_result(self, response, start_time: float) -> Dict[str, Any]:
         return {
             "text": response.text,
             "duration": time.time() - start_time,
-            "provider": f"gemini_3.0_{self.model_name}"
+            "provider": self.provider_name
+        }
+
+class CachingProvider(TranscriptionProvider):
+    """Wraps a provider and reuses stored results for audio it has already transcribed"""
+
+    def __init__(self, inner: TranscriptionProvider, redis_url: Optional[str] = None, ttl: int = TRANSCRIPT_CACHE_TTL):
+        import redis
+
+        self.inner = inner
+        self.ttl = ttl
+        self._redis = redis.from_url(redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        self._redis_error = redis.RedisError
+
+    def __getattr__(self, name: str) -> Any:
+        # Provider-specific extras (e.g. Gemini's transcribe_many) go straight to the wrapped provider.
+        # Read inner from __dict__: before __init__ sets it (copy, unpickling, a failed __init__)
+        # getattr(self.inner, ...) would re-enter __getattr__ without end
+        try:
+            inner = self.__dict__["inner"]
+        except KeyError:
+            raise AttributeError(name) from None
+        return getattr(inner, name)
+
+    def transcribe(self, audio_path: Path) -> Dict[str, Any]:
+        key = self._cache_key(audio_path)
+        try:
+            cached = self._redis.get(key)
+        except self._redis_error as e:
+            logger.warning(f"Transcript cache unavailable, transcribing without it: {e}")
+            return self.inner.transcribe(audio_path)
+        if cached is not None:
+            logger.info(f"Transcript cache hit for {audio_path}")
+            return orjson.loads(cached)
+
+        result = self.inner.transcribe(audio_path)
+        try:
+            self._redis.setex(key, self.ttl, orjson.dumps(result, default=_to_jsonable))
+        except (self._redis_error, TypeError) as e:
+            logger.warning(f"Could not cache transcript for {audio_path}: {e}")
+        return result
+
+    def transcribe_stream(self, audio_path: Path) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        key = self._cache_key(audio_path)
+        try:
+            cached = self._redis.get(key)
+        except self._redis_error as e:
+            logger.warning(f"Transcript cache unavailable, transcribing without it: {e}")
+            yield from self.inner.transcribe_stream(audio_path)
+            return
+        if cached is not None:
+            logger.info(f"Transcript cache hit for {audio_path}")
+            yield from iter_result_lines(orjson.loads(cached))
+            return
+
+        # Pass lines through as they arrive, and cache the assembled result at the end
+        start_time = time.time()
+        lines = []
+        segments = []
+        for line, segment in self.inner.transcribe_stream(audio_path):
+            lines.append(line)
+            if segment is not None:
+                segments.append(segment)
+            yield line, segment
+        result = {
+            "text": "\n".join(lines),
+            "segments": segments,
+            "duration": time.time() - start_time,
+            "provider": getattr(self.inner, "provider_name", self.inner.__class__.__name__),
         }
+        try:
+            self._redis.setex(key, self.ttl, orjson.dumps(result, default=_to_jsonable))
+        except (self._redis_error, TypeError) as e:
+            logger.warning(f"Could not cache transcript for {audio_path}: {e}")
+
+    def _cache_key(self, audio_path: Path) -> str:
+        model_name = getattr(self.inner, "model_name", "")
+        return f"transcript:{self.inner.__class__.__name__}:{model_name}:{_file_sha256(audio_path)}"
+
+def _to_jsonable(value: Any) -> Any:
+    """orjson fallback for SDK objects (e.g. OpenAI segments) in provider results"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
 
-def get_provider(provider_type: str, **kwargs) -> TranscriptionProvider:
+def get_provider(provider_type: str, cache: bool = True, **kwargs) -> TranscriptionProvider:
+    provider = _build_provider(provider_type, **kwargs)
+    return CachingProvider(provider) if cache else provider
+
+def _build_provider(provider_type: str, **kwargs) -> TranscriptionProvider:
     if provider_type == "local":
-        return LocalWhisperProvider(model_name=kwargs.get("whisper_model", "base"))
+        return LocalWhisperProvider(
+            model_name=kwargs.get("whisper_model", "base"),
+            device=kwargs.get("whisper_device"),
+            fp16=kwargs.get("whisper_fp16")
+        )
     elif provider_type == "openai":
         return OpenAIWhisperProvider(api_key=kwargs.get("openai_api_key"))
     elif provider_type == "gemini":
@@ -1,11 +1,40 @@
+import json
 import subprocess
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 from .logger import get_logger
 
 logger = get_logger(__name__, service_name="audio-extractor")
 
+@lru_cache(maxsize=256)
+def _probe_streams(path: str, mtime_ns: int, size: int) -> Tuple[Tuple[str, str, str, int], ...]:
+    """ffprobe (codec_type, codec_name, sample_rate, channels) per stream; cached per file version"""
+    command = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "stream=codec_type,codec_name,sample_rate,channels",
+        "-of", "json",
+        path
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        return ()
+    streams = json.loads(result.stdout or "{}").get("streams", [])
+    return tuple(
+        (s.get("codec_type", ""), s.get("codec_name", ""), s.get("sample_rate", ""), s.get("channels", 0))
+        for s in streams
+    )
+
+def is_transcription_ready(path: str) -> bool:
+    """True if the file is already audio-only 16kHz mono 16-bit PCM (what extract_audio produces)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    streams = _probe_streams(str(path), stat.st_mtime_ns, stat.st_size)
+    return streams == (("audio", "pcm_s16le", "16000", 1),)
+
 def extract_audio(video_path: str, output_dir: Optional[str] = None) -> Optional[str]:
     """
     Extract audio from video file using FFmpeg.
@@ -16,35 +45,154 @@ def extract_audio(video_path: str, output_dir: Optional[str] = None) -> Optional
         logger.error(f"Video file not found: {video_path}")
         return None
 
+    if is_transcription_ready(str(video_path_obj)):
+        logger.info(f"Already 16kHz mono PCM, skipping extraction: {video_path}")
+        return str(video_path_obj)
+
     if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
         audio_path = Path(output_dir) / f"{video_path_obj.stem}.wav"
     else:
         audio_path = video_path_obj.with_suffix(".wav")
 
     logger.info(f"Extracting audio: {video_path} -> {audio_path}")
+    # ffmpeg writes the WAV header first, so an interrupted run would leave a file
+    # that probes as valid; only move it onto the final name once ffmpeg succeeds
+    partial_path = audio_path.with_name(f"{audio_path.name}.part")
     
     try:
         command = [
-            "ffmpeg", "-i", str(video_path_obj),
+            "ffmpeg", "-loglevel", "error", "-nostats",
+            "-i", str(video_path_obj),
             "-ss", "0",          # Start at zero
             "-map_metadata", "-1", # Strip metadata that might contain time offsets
             "-vn",              # Disable video
             "-acodec", "pcm_s16le", # 16-bit PCM
             "-ar", "16000",     # 16kHz
             "-ac", "1",          # Mono
-            str(audio_path),
+            "-f", "wav",        # The .part suffix hides the container from ffmpeg
+            str(partial_path),
             "-y"                # Overwrite
         ]
         
-        result = subprocess.run(command, capture_output=True, text=True)
+        # Only errors reach stderr, and stdout is never read
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         if result.returncode != 0:
             logger.error(f"FFmpeg failed: {result.stderr}")
+            partial_path.unlink(missing_ok=True)
             return None
+        os.replace(partial_path, audio_path)
             
         logger.info(f"Audio extraction successful: {audio_path}")
         return str(audio_path)
         
     except Exception as e:
         logger.error(f"Unexpected error during audio extraction: {e}")
+        partial_path.unlink(missing_ok=True)
         return None
 
+def extract_audio_stream(video_path: str, block_size: int = 65536) -> Iterator[bytes]:
+    """
+    Decode audio through an FFmpeg pipe as raw 16kHz mono 16-bit PCM blocks,
+    without writing an intermediate WAV file.
+    """
+    command = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", str(video_path),
+        "-vn",
+        "-acodec", "pcm_s16le",
+        "-ar", "16000",
+        "-ac", "1",
+        "-f", "s16le",
+        "-"
+    ]
+    
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while block := process.stdout.read(block_size):
+            yield block
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"FFmpeg decoding failed: {stderr.decode(errors='replace')}")
+    finally:
+        # Consumer stopped early or decoding failed
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+def load_audio_array(video_path: str):
+    """Decode a media file into the float32 waveform (16kHz mono) that Whisper models accept"""
+    import numpy as np
+    
+    pcm = b"".join(extract_audio_stream(video_path))
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+def compress_audio(audio_path: str, output_dir: str, bitrate: str = "24k") -> Optional[str]:
+    """
+    Re-encode audio to Opus (speech-friendly, ~6x smaller than 16 kHz PCM) for uploads.
+    Returns the .ogg path, or None on failure.
+    """
+    audio_path_obj = Path(audio_path)
+    opus_path = Path(output_dir) / f"{audio_path_obj.stem}.ogg"
+    
+    command = [
+        "ffmpeg", "-loglevel", "error", "-nostats",
+        "-i", str(audio_path_obj),
+        "-vn",
+        "-c:a", "libopus",
+        "-b:a", bitrate,
+        str(opus_path),
+        "-y"
+    ]
+    
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        logger.error(f"FFmpeg Opus encoding failed: {result.stderr}")
+        return None
+    return str(opus_path)
+
+def split_audio(audio_path: str, segment_seconds: int, output_dir: str) -> List[str]:
+    """
+    Split audio into fixed-length segments using FFmpeg (stream copy, no re-encode).
+    Returns the segment paths in playback order, or an empty list on failure.
+    """
+    audio_path_obj = Path(audio_path)
+    pattern = Path(output_dir) / f"{audio_path_obj.stem}_chunk_%03d{audio_path_obj.suffix}"
+    
+    command = [
+        "ffmpeg", "-loglevel", "error", "-nostats",
+        "-i", str(audio_path_obj),
+        "-f", "segment",
+        "-segment_time", str(segment_seconds),
+        "-c", "copy",
+        str(pattern),
+        "-y"
+    ]
+    
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        logger.error(f"FFmpeg segmenting failed: {result.stderr}")
+        return []
+    
+    # Zero-padded indices sort in playback order
+    return sorted(str(p) for p in Path(output_dir).glob(f"{audio_path_obj.stem}_chunk_*{audio_path_obj.suffix}"))
+
+def probe_duration(audio_path: str) -> Optional[float]:
+    """Return the media duration in seconds using ffprobe, or None if it can't be read"""
+    command = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        str(audio_path)
+    ]
+    
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        logger.error(f"FFprobe failed: {result.stderr}")
+        return None
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
@@ -0,0 +1,18 @@
+"""Persistent on-disk caches shared across runs and worker processes"""
+
+import os
+from pathlib import Path
+from typing import Dict
+
+from diskcache import Cache
+
+_caches: Dict[str, Cache] = {}
+
+
+def get_cache(name: str) -> Cache:
+    """Get (or open) the named on-disk cache under STORAGE_PATH/cache"""
+    cache = _caches.get(name)
+    if cache is None:
+        directory = Path(os.getenv("STORAGE_PATH", "./data")) / "cache" / name
+        cache = _caches.setdefault(name, Cache(str(directory)))
+    return cache
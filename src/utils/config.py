@@ -1,10 +1,28 @@
 """Configuration management"""
 
+import copy
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 import yaml
 
+try:
+    # libyaml C loader (~10x faster than the pure-Python one)
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# Default to config/config.yaml relative to project root
+_DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "config.yaml"
+
+
+@lru_cache(maxsize=8)
+def _read_yaml(path: str, mtime_ns: int) -> dict:
+    """Parse a YAML file; cached until the file's mtime changes"""
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_Loader) or {}
+
 
 class Config:
     """Application configuration"""
@@ -12,9 +30,7 @@ class Config:
     def __init__(self, config_path: Optional[Path] = None):
         """Load configuration from YAML file and environment variables"""
         if config_path is None:
-            # Default to config/config.yaml relative to project root
-            project_root = Path(__file__).parent.parent.parent
-            config_path = project_root / "config" / "config.yaml"
+            config_path = _DEFAULT_CONFIG_PATH
         
         self.config_path = config_path
         self._config = self._load_yaml(config_path)
@@ -25,8 +41,8 @@ class Config:
         if not config_path.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
         
-        with open(config_path, "r") as f:
-            return yaml.safe_load(f) or {}
+        # Copy since env overrides mutate the loaded config
+        return copy.deepcopy(_read_yaml(str(config_path), config_path.stat().st_mtime_ns))
     
     def _apply_env_overrides(self):
         """Apply environment variable overrides"""
@@ -76,7 +92,19 @@ class Config:
         return value
 
 
-def load_config(config_path: Optional[Path] = None) -> Config:
-    """Load and return configuration"""
+@lru_cache(maxsize=8)
+def _load_config(config_path: Path, mtime_ns: int) -> Config:
+    """Config for one version of a config file"""
     return Config(config_path)
 
+
+def load_config(config_path: Optional[Path] = None) -> Config:
+    """Load and return configuration (memoized per config path until the file changes)"""
+    config_path = Path(config_path) if config_path is not None else _DEFAULT_CONFIG_PATH
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        # Let Config raise its FileNotFoundError
+        return Config(config_path)
+    return _load_config(config_path, mtime_ns)
+
@@ -2,10 +2,15 @@
 
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 from dateutil import parser as date_parser
 
+_PART_SUFFIX_RE = re.compile(r'\s*-\s*Part\s+\d+', re.IGNORECASE)
+_SENATE_DATE_RE = re.compile(r'(\d{2})-(\d{2})-(\d{2})')
 
+
+@lru_cache(maxsize=4096)
 def parse_date(date_string: str, default: Optional[datetime] = None) -> Optional[datetime]:
     """Generic date parser that tries multiple formats"""
     if not date_string:
@@ -17,12 +22,16 @@ def parse_date(date_string: str, default: Optional[datetime] = None) -> Optional
         return default
 
 
+@lru_cache(maxsize=4096)
 def parse_house_date(date_string: str) -> Optional[datetime]:
     """
     Parse date from House archive format.
     Examples: 
     - "Thursday, February 20, 2025"
     - "Wednesday, April 16, 2025 - Part 2"
+
+    Results are memoized since the same date string recurs across many
+    committee entries on an archive page.
     """
     if not date_string:
         return None
@@ -32,7 +41,7 @@ def parse_house_date(date_string: str) -> Optional[datetime]:
         date_string = date_string.strip()
         
         # Remove suffixes like " - Part 2", " - Part 1", etc.
-        date_string = re.sub(r'\s*-\s*Part\s+\d+', '', date_string, flags=re.IGNORECASE)
+        date_string = _PART_SUFFIX_RE.sub('', date_string)
         
         if "," in date_string:
             # Format: "Thursday, February 20, 2025"
@@ -40,7 +49,11 @@ def parse_house_date(date_string: str) -> Optional[datetime]:
             if len(parts) == 2:
                 date_string = parts[1].strip()
         
-        return date_parser.parse(date_string)
+        # Archive dates are almost always "February 20, 2025"; dateutil is the slow fallback
+        try:
+            return datetime.strptime(date_string, "%B %d, %Y")
+        except ValueError:
+            return date_parser.parse(date_string)
     except (ValueError, TypeError):
         return None
 
@@ -55,16 +68,12 @@ def parse_senate_date(date_string: str) -> Optional[datetime]:
     
     try:
         # Extract date pattern YY-MM-DD from string
-        import re
-        pattern = r'(\d{2})-(\d{2})-(\d{2})'
-        match = re.search(pattern, date_string)
+        match = _SENATE_DATE_RE.search(date_string)
         
         if match:
             year, month, day = match.groups()
             # Convert YY to YYYY (assuming 20XX)
-            year = f"20{year}"
-            date_string = f"{year}-{month}-{day}"
-            return datetime.strptime(date_string, "%Y-%m-%d")
+            return datetime(2000 + int(year), int(month), int(day))
         
         # Fallback to generic parser
         return parse_date(date_string)
@@ -1,12 +1,13 @@
 import logging
-import json
 import sys
+import time
 import uuid
 import os
 from pathlib import Path
-from datetime import datetime
 from typing import Any, Dict, Optional
 
+import orjson
+
 class JsonFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
@@ -22,8 +23,12 @@ class JsonFormatter(logging.Formatter):
         self.service_name = service_name
 
     def format(self, record: logging.LogRecord) -> str:
+        # record.created is already the epoch time of the call; format it without building a datetime
+        created = record.created
+        micros = int((created - int(created)) * 1_000_000)
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(created)) + f".{micros:06d}Z"
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": timestamp,
             "level": record.levelname,
             "service": self.service_name,
             "message": record.getMessage(),
@@ -46,7 +51,7 @@ class JsonFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str).decode()
 
 def get_logger(name: str, service_name: str = "stateaffair-worker") -> logging.Logger:
     """Get a configured JSON logger"""
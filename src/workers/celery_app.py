@@ -15,6 +15,14 @@ app = Celery(
 )
 
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_init
+from kombu import Exchange, Queue
+
+# One queue per pipeline stage so each worker type only consumes its own work.
+# Queue durability/delivery-mode flags are no-ops on the Redis transport; Postgres is the
+# source of truth and requeue_failed_tasks re-dispatches failed work and anything stuck
+# pending/in progress (e.g. after a Redis restart drops queued messages)
+TASK_QUEUES = ("discovery", "download", "audio", "transcription", "maintenance")
 
 # Configuration
 app.conf.update(
@@ -25,8 +33,52 @@ app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=3600, # 1 hour max
+    worker_max_tasks_per_child=200, # Recycle processes so cached models/allocator growth stay bounded
+    # Downloads/transcriptions run for minutes: take one task at a time so idle workers
+    # aren't starved, and only ack once done so a lost worker's task is redelivered
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_acks_on_failure_or_timeout=False,
+    # Redis redelivers unacked messages after visibility_timeout (default 1h, equal to the
+    # time limit); keep it well above task_time_limit so running tasks aren't duplicated
+    broker_transport_options={"visibility_timeout": 6 * 3600},
+    task_queues=tuple(
+        Queue(name, Exchange(name), routing_key=name) for name in TASK_QUEUES
+    ),
 )
 
+@worker_process_init.connect
+def init_db_manager(**_):
+    """Create this worker process's DB manager (engine + pool) once, after the fork"""
+    from src.database.db_manager import get_db_manager
+    get_db_manager()
+
+@worker_init.connect
+def init_gevent_worker(**_):
+    """Under the gevent pool (no fork, so worker_process_init never fires): make psycopg2
+    yield to the hub instead of blocking every greenlet, then create the DB manager"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return
+    if not monkey.is_module_patched("socket"):
+        return
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+    from src.database.db_manager import get_db_manager
+    get_db_manager()
+
+@worker_process_init.connect
+def preload_whisper_model(**_):
+    """Load the local Whisper model before the worker process takes tasks (transcription workers only)"""
+    if os.getenv("PRELOAD_WHISPER_MODEL", "").lower() not in ("1", "true", "yes"):
+        return
+    if os.getenv("TRANSCRIPTION_PROVIDER", "local") != "local":
+        return
+    from src.services.transcription_service import _load_whisper_model, _resolve_device
+    _load_whisper_model(os.getenv("WHISPER_MODEL", "base"), _resolve_device())
+
 # Scheduled tasks
 app.conf.beat_schedule = {
     'auto-discover-every-hour': {
@@ -1,21 +1,82 @@
+import hashlib
 import os
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
 
+import orjson
+from celery.signals import worker_init
+from sqlalchemy import or_
+
 from .celery_app import app
 
 from ..services.discovery_service import DiscoveryService
 from ..services.download_service import DownloadService
 from ..services.state_service import StateService
-from ..database.db_manager import get_db_manager
-from ..utils.audio_extractor import extract_audio
+from ..database.db_manager import VideoRecord, get_db_manager
+from ..utils.audio_extractor import extract_audio, is_transcription_ready
 from ..utils.logger import get_logger, generate_trace_id
 from ..services.transcription_service import get_provider
 from ..models.processing_status import DownloadStatus, AudioStatus, TranscriptionStatus
+from ..models.video_metadata import VideoMetadata
 
 logger = get_logger(__name__, service_name="celery-tasks")
 
+# Resolved once per process rather than per task
+STORAGE_ROOT = Path(os.getenv("STORAGE_PATH", "./data"))
+VIDEO_DIR = STORAGE_ROOT / "videos"
+AUDIO_DIR = STORAGE_ROOT / "audio"
+TRANSCRIPT_DIR = STORAGE_ROOT / "transcripts"
+
+# In-progress work untouched for longer than this is assumed to have lost its worker and
+# broker message (well above task_time_limit and the broker visibility timeout)
+STALE_TASK_AGE = timedelta(hours=int(os.getenv("STALE_TASK_HOURS", "12")))
+
+
+@worker_init.connect
+def create_storage_dirs(**_):
+    """Create the storage directories once when the worker starts (fires for every pool type)"""
+    for directory in (VIDEO_DIR, AUDIO_DIR, TRANSCRIPT_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
+@lru_cache(maxsize=1)
+def _transcription_provider():
+    """(provider type, provider) configured from env, built once per worker process"""
+    provider_type = os.getenv("TRANSCRIPTION_PROVIDER", "local")
+    kwargs = {
+        "whisper_model": os.getenv("WHISPER_MODEL", "base"),
+        "whisper_device": os.getenv("WHISPER_DEVICE"),
+        "openai_api_key": os.getenv("OPENAI_API_KEY"),
+        "google_api_key": os.getenv("GOOGLE_API_KEY"),
+        "gemini_model": os.getenv("GEMINI_MODEL")
+    }
+    return provider_type, get_provider(provider_type, **kwargs)
+
+@lru_cache(maxsize=1)
+def _download_service() -> DownloadService:
+    """Download service (HTTP pool, blob handler, scrapers) shared by every task in this worker process"""
+    # Large read chunks keep write syscalls (and CPU) low while streaming straight to disk
+    return DownloadService(
+        state_service=StateService(get_db_manager()),
+        output_directory=VIDEO_DIR,
+        chunk_size=int(os.getenv("HTTP_CHUNK_SIZE", str(1024 * 1024))),
+    )
+
+@lru_cache(maxsize=256)
+def _parse_iso(value: str) -> datetime:
+    """Parse YYYY-MM-DD or ISO datetime strings (Python 3.11 fromisoformat, trailing Z = UTC)"""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value[:10], "%Y-%m-%d")
+
+def _parse_date(value):
+    """Task arguments arrive as ISO strings over JSON, or as datetimes when called directly"""
+    return _parse_iso(value) if isinstance(value, str) else value
+
 @app.task(name="src.workers.tasks.discover_videos_task", queue="discovery")
 def discover_videos_task(
     source: Optional[str] = None,
@@ -29,33 +90,11 @@ def discover_videos_task(
     # Determine date parameters
     if start_date and end_date:
         # Parse ISO format date strings (YYYY-MM-DD format from date_input)
-        if isinstance(start_date, str):
-            try:
-                # Handle date-only strings (YYYY-MM-DD)
-                if len(start_date) == 10:
-                    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                else:
-                    # Handle datetime strings with timezone
-                    start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            except ValueError:
-                start_dt = datetime.fromisoformat(start_date)
-        else:
-            start_dt = start_date
-        
-        if isinstance(end_date, str):
-            try:
-                # Handle date-only strings (YYYY-MM-DD)
-                if len(end_date) == 10:
-                    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                    # Set to end of day
-                    end_dt = end_dt.replace(hour=23, minute=59, second=59)
-                else:
-                    # Handle datetime strings with timezone
-                    end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            except ValueError:
-                end_dt = datetime.fromisoformat(end_date)
-        else:
-            end_dt = end_date
+        start_dt = _parse_date(start_date)
+        end_dt = _parse_date(end_date)
+        if isinstance(end_date, str) and len(end_date) == 10:
+            # Date-only end: include the whole day
+            end_dt = end_dt.replace(hour=23, minute=59, second=59)
         
         logger.info(f"Starting discovery task for source={source}, date_range={start_dt.date()} to {end_dt.date()}", extra={"trace_id": trace_id})
     else:
@@ -69,41 +108,61 @@ def discover_videos_task(
     discovery_service = DiscoveryService()
     state_service = StateService(db_manager)
     
-    # Discover videos
+    # Discover videos; each archive's batch is handed to the download queue as soon as
+    # that archive finishes instead of waiting for the slowest one
     if start_dt and end_dt:
-        videos = discovery_service.discover_videos(
+        batches = discovery_service.iter_discovered_batches(
             start_date=start_dt,
             end_date=end_dt,
             source=source,
         )
     else:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        videos = discovery_service.discover_videos(cutoff_date=cutoff_date, source=source)
+        batches = discovery_service.iter_discovered_batches(cutoff_date=cutoff_date, source=source)
     
-    for video in videos:
-        # Mark as discovered in DB
-        state_service.mark_video_discovered(video)
-        # Dispatch download task to download queue
-        download_video_task.apply_async(args=[video.video_id, video.source], queue="download")
+    dispatched = 0
+    for videos in batches:
+        # Mark as discovered in DB (one transaction per batch); videos already known
+        # are not downloaded again (failed ones are retried by requeue_failed_tasks)
+        new_videos = state_service.mark_videos_discovered(videos)
+        dispatched += _dispatch_downloads(new_videos)
         
-    logger.info(f"Discovery complete. Dispatched {len(videos)} download tasks.", extra={"trace_id": trace_id})
+    logger.info(f"Discovery complete. Dispatched {dispatched} download tasks.", extra={"trace_id": trace_id})
+
+def _dispatch_downloads(videos) -> int:
+    """Queue a download task per video, publishing them all through one broker connection"""
+    return _dispatch(download_video_task, "download", [(video.video_id, video.source) for video in videos])
+
+def _dispatch(task, queue: str, id_source_pairs) -> int:
+    """Queue task(video_id, source, ...) for each argument tuple through a single pooled producer"""
+    with app.producer_pool.acquire(block=True) as producer:
+        for args in id_source_pairs:
+            task.apply_async(args=list(args), queue=queue, producer=producer)
+    return len(id_source_pairs)
 
 @app.task(name="src.workers.tasks.download_video_task", queue="download")
 def download_video_task(video_id: str, source: str):
-    """Download video and extract audio"""
+    """Download video, then hand audio extraction to the audio queue"""
     trace_id = generate_trace_id()
     logger.info(f"Starting download task for {video_id} ({source})", extra={"trace_id": trace_id})
     
     db_manager = get_db_manager()
-    state_service = StateService(db_manager)
     
     # Get metadata from DB
     record = db_manager.get_video_record(video_id, source)
     if not record:
         logger.error(f"Video record not found in DB: {video_id}", extra={"trace_id": trace_id})
         return
+    
+    # Late acks mean a task can be redelivered after it already finished
+    if record.download_status == DownloadStatus.DOWNLOADED and record.audio_status == AudioStatus.EXTRACTED:
+        logger.info(f"Already downloaded and extracted: {video_id}", extra={"trace_id": trace_id})
+        return
+    if record.download_status == DownloadStatus.DOWNLOADED and record.download_path and os.path.exists(record.download_path):
+        logger.info(f"Already downloaded, queueing audio extraction: {video_id}", extra={"trace_id": trace_id})
+        extract_audio_task.apply_async(args=[video_id, source, record.download_path], queue="audio")
+        return
 
-    from ..models.video_metadata import VideoMetadata
     video_meta = VideoMetadata.from_dict({
         "id": record.id,
         "source": record.source,
@@ -115,33 +174,41 @@ def download_video_task(video_id: str, source: str):
         "title": record.title
     })
 
-    # Download Service
-    output_dir = Path(os.getenv("STORAGE_PATH", "./data")) / "videos"
-    download_service = DownloadService(state_service=state_service, output_directory=output_dir)
-    
     db_manager.update_video_status(video_id, source, download_status=DownloadStatus.IN_PROGRESS)
-    result = download_service.download_video(video_meta)
+    result = _download_service().download_video(video_meta)
     
     if result.success:
         logger.info(f"Download successful: {result.file_path}", extra={"trace_id": trace_id})
         db_manager.update_video_status(video_id, source, download_status=DownloadStatus.DOWNLOADED, download_path=str(result.file_path))
-        
-        # Audio Extraction
-        db_manager.update_video_status(video_id, source, audio_status=AudioStatus.EXTRACTING)
-        audio_dir = Path(os.getenv("STORAGE_PATH", "./data")) / "audio"
-        audio_dir.mkdir(parents=True, exist_ok=True)
-        
-        audio_path = extract_audio(str(result.file_path), output_dir=str(audio_dir))
-        if audio_path:
-            db_manager.update_video_status(video_id, source, audio_status=AudioStatus.EXTRACTED, audio_path=audio_path)
-            # Dispatch transcription task to transcription queue
-            transcribe_audio_task.apply_async(args=[video_id, source], queue="transcription")
-        else:
-            db_manager.update_video_status(video_id, source, audio_status=AudioStatus.FAILED)
+        # ffmpeg is CPU-bound; run it on the audio workers so this slot goes back to downloading
+        extract_audio_task.apply_async(args=[video_id, source, str(result.file_path)], queue="audio")
     else:
         logger.error(f"Download failed: {result.error_message}", extra={"trace_id": trace_id})
         db_manager.update_video_status(video_id, source, download_status=DownloadStatus.FAILED)
 
+@app.task(name="src.workers.tasks.extract_audio_task", queue="audio")
+def extract_audio_task(video_id: str, source: str, video_path: str):
+    """Extract transcription audio from a downloaded video"""
+    trace_id = generate_trace_id()
+    logger.info(f"Starting audio extraction task for {video_id} ({source})", extra={"trace_id": trace_id})
+    
+    db_manager = get_db_manager()
+    # A previous run may have extracted the audio and died before recording it;
+    # in that case go straight to EXTRACTED without the intermediate status write
+    expected_audio = AUDIO_DIR / f"{Path(video_path).stem}.wav"
+    if expected_audio.exists() and expected_audio.stat().st_size > 0 and is_transcription_ready(str(expected_audio)):
+        logger.info(f"Reusing extracted audio: {expected_audio}", extra={"trace_id": trace_id})
+        audio_path = str(expected_audio)
+    else:
+        db_manager.update_video_status(video_id, source, audio_status=AudioStatus.EXTRACTING)
+        audio_path = extract_audio(video_path, output_dir=str(AUDIO_DIR))
+    if audio_path:
+        db_manager.update_video_status(video_id, source, audio_status=AudioStatus.EXTRACTED, audio_path=audio_path)
+        # Dispatch transcription task to transcription queue
+        transcribe_audio_task.apply_async(args=[video_id, source], queue="transcription")
+    else:
+        db_manager.update_video_status(video_id, source, audio_status=AudioStatus.FAILED)
+
 @app.task(name="src.workers.tasks.transcribe_audio_task", queue="transcription")
 def transcribe_audio_task(video_id: str, source: str):
     """Transcribe extracted audio using configured provider"""
@@ -154,37 +221,45 @@ def transcribe_audio_task(video_id: str, source: str):
     if not record or not record.audio_path:
         logger.error(f"Audio path not found for {video_id}", extra={"trace_id": trace_id})
         return
+    
+    if record.transcription_status == TranscriptionStatus.COMPLETED:
+        logger.info(f"Already transcribed: {video_id}", extra={"trace_id": trace_id})
+        return
 
     db_manager.update_video_status(video_id, source, transcription_status=TranscriptionStatus.IN_PROGRESS)
     
     try:
-        # Get provider settings from env
-        provider_type = os.getenv("TRANSCRIPTION_PROVIDER", "local")
-        kwargs = {
-            "whisper_model": os.getenv("WHISPER_MODEL", "base"),
-            "openai_api_key": os.getenv("OPENAI_API_KEY"),
-            "google_api_key": os.getenv("GOOGLE_API_KEY"),
-            "gemini_model": os.getenv("GEMINI_MODEL")
-        }
-        
-        provider = get_provider(provider_type, **kwargs)
-        result = provider.transcribe(Path(record.audio_path))
+        provider_type, provider = _transcription_provider()
         
         # Save transcript to disk (VTT placeholder logic here)
-        transcript_dir = Path(os.getenv("STORAGE_PATH", "./data")) / "transcripts"
-        transcript_dir.mkdir(parents=True, exist_ok=True)
+        # In a real app, we'd generate VTT here. For now, we save text/json, writing
+        # lines and segments as the provider produces them
+        text_path = TRANSCRIPT_DIR / f"{video_id}.txt"
+        segments_path = TRANSCRIPT_DIR / f"{video_id}.segments.jsonl"
+        TRANSCRIPT_DIR.mkdir(parents=True, exist_ok=True)
+        lines = []
+        with open(text_path, "w", buffering=1 << 20) as text_file, \
+                open(segments_path, "wb", buffering=1 << 20) as segments_file:
+            for line, segment in provider.transcribe_stream(Path(record.audio_path)):
+                text_file.write(f"\n{line}" if lines else line)
+                lines.append(line)
+                if segment is not None:
+                    segments_file.write(orjson.dumps(segment, default=str) + b"\n")
         
-        # In a real app, we'd generate VTT here. For now, we save text/json
-        text_path = transcript_dir / f"{video_id}.txt"
-        with open(text_path, "w") as f:
-            f.write(result["text"])
+        with open(text_path, "rb") as text_file:
+            text_sha256 = hashlib.file_digest(text_file, "sha256").hexdigest()
             
-        # Register in Postgres Registry
+        # Register in Postgres Registry; the text stays searchable there, while segments
+        # live only on disk and the row just points at them
         db_manager.add_transcript(
             video_id=video_id,
             provider=provider_type,
-            content=result["text"],
-            raw_data=result.get("segments") or result, # Save segments if available
+            content="\n".join(lines),
+            raw_data={
+                "segments_path": str(segments_path),
+                "sha256": text_sha256,
+                "byte_size": text_path.stat().st_size,
+            },
             vtt_path=str(text_path) # Placeholder
         )
         
@@ -228,54 +303,120 @@ def auto_discover_new_videos_task():
             resolve_streams=False,
         )
         
-        new_count = 0
-        for video in videos:
-            if not db_manager.video_exists(video.video_id, video.source):
-                state_service.mark_video_discovered(video)
-                download_video_task.delay(video.video_id, video.source)
-                new_count += 1
+        new_videos = state_service.mark_videos_discovered(videos)
+        new_count = _dispatch_downloads(new_videos)
         
         logger.info(f"Auto-discovery for {source} complete. Found {new_count} new videos.", extra={"trace_id": trace_id})
         total_new += new_count
         
     return {"new_videos": total_new}
 
-@app.task(name="src.workers.tasks.requeue_failed_tasks", queue="transcription")
+def _update_videos(session, video_ids, values: dict) -> None:
+    """Bulk UPDATE the given videos, chunked to stay under SQLite's bound-parameter limit"""
+    video_ids = list(video_ids)
+    for i in range(0, len(video_ids), 500):
+        session.query(VideoRecord).filter(VideoRecord.id.in_(video_ids[i:i + 500])).update(
+            values, synchronize_session=False,
+        )
+
+@app.task(name="src.workers.tasks.requeue_failed_tasks", queue="maintenance")
 def requeue_failed_tasks():
-    """Find failed tasks and re-queue them if files exist, otherwise restart from download"""
+    """Find failed tasks and re-queue them if files exist, otherwise restart from download.
+    Also re-dispatches in-progress work that has been stuck past STALE_TASK_AGE."""
     db_manager = get_db_manager()
-    session = db_manager.get_session()
-    from ..database.db_manager import VideoRecord
-    from ..models.processing_status import DownloadStatus, TranscriptionStatus
     
-    # 1. Find failed transcriptions
-    failed_transcripts = session.query(VideoRecord).filter(VideoRecord.transcription_status == "failed").all()
-    requeued_count = 0
-    restarted_count = 0
+    # 1. Find failed transcriptions (only the needed columns, streamed in batches)
+    requeue = []  # Audio still on disk: transcribe again
+    restart = []  # Audio/video missing: start over from download
+    with db_manager.session_scope() as session:
+        failed_transcripts = (
+            session.query(VideoRecord.id, VideoRecord.source, VideoRecord.audio_path)
+            .filter(VideoRecord.transcription_status == "failed")
+            .execution_options(stream_results=True)
+            .yield_per(500)
+        )
+        for video_id, source, audio_path in failed_transcripts:
+            if audio_path and os.path.exists(audio_path):
+                logger.info(f"Re-queueing transcription for {video_id} (audio exists)")
+                requeue.append((video_id, source))
+            else:
+                logger.info(f"Restarting download for {video_id} (audio/video missing)")
+                restart.append((video_id, source))
+
+    # 2. Find failed downloads and reset every restarted record in one UPDATE per status change
+    with db_manager.session_scope() as session:
+        restart_ids = {video_id for video_id, _ in restart}
+        retry = [
+            (video_id, source)
+            for video_id, source in session.query(VideoRecord.id, VideoRecord.source).filter(VideoRecord.download_status == "failed")
+            if video_id not in restart_ids
+        ]
+        if restart:
+            _update_videos(
+                session,
+                restart_ids,
+                {"download_status": DownloadStatus.PENDING, "transcription_status": TranscriptionStatus.PENDING},
+            )
+        if retry:
+            logger.info(f"Retrying {len(retry)} failed downloads")
+            _update_videos(session, [video_id for video_id, _ in retry], {"download_status": DownloadStatus.PENDING})
     
-    for record in failed_transcripts:
-        if record.audio_path and os.path.exists(record.audio_path):
-            logger.info(f"Re-queueing transcription for {record.id} (audio exists)")
-            transcribe_audio_task.delay(record.id, record.source)
-            requeued_count += 1
-        else:
-            logger.info(f"Restarting download for {record.id} (audio/video missing)")
-            db_manager.update_video_status(
-                record.id, record.source, 
-                download_status=DownloadStatus.PENDING,
-                transcription_status=TranscriptionStatus.PENDING
+    # 3. Find stuck work: a record whose worker died along with its message stays in progress
+    # with nothing left to pick it up. PENDING is never treated as lost: the dashboard and CLI
+    # record discovered videos as pending on purpose without dispatching them
+    handled = {video_id for video_id, _ in requeue + restart + retry}
+    stale_downloads = []
+    stale_audio = []
+    stale_transcripts = []
+    with db_manager.session_scope() as session:
+        stuck = (
+            session.query(
+                VideoRecord.id,
+                VideoRecord.source,
+                VideoRecord.download_status,
+                VideoRecord.audio_status,
+                VideoRecord.transcription_status,
+                VideoRecord.download_path,
             )
-            download_video_task.delay(record.id, record.source)
-            restarted_count += 1
-
-    # 2. Find failed downloads
-    failed_downloads = session.query(VideoRecord).filter(VideoRecord.download_status == "failed").all()
-    for record in failed_downloads:
-        logger.info(f"Retrying download for {record.id}")
-        db_manager.update_video_status(record.id, record.source, download_status=DownloadStatus.PENDING)
-        download_video_task.delay(record.id, record.source)
-        restarted_count += 1
+            .filter(VideoRecord.updated_at < datetime.utcnow() - STALE_TASK_AGE)
+            .filter(or_(
+                VideoRecord.download_status == DownloadStatus.IN_PROGRESS,
+                VideoRecord.audio_status == AudioStatus.EXTRACTING,
+                VideoRecord.transcription_status == TranscriptionStatus.IN_PROGRESS,
+            ))
+        )
+        for video_id, source, download_status, audio_status, transcription_status, download_path in stuck:
+            if video_id in handled:
+                continue
+            if download_status == DownloadStatus.IN_PROGRESS:
+                stale_downloads.append((video_id, source))
+            elif download_status == DownloadStatus.DOWNLOADED and audio_status == AudioStatus.EXTRACTING:
+                stale_audio.append((video_id, source, download_path))
+            elif audio_status == AudioStatus.EXTRACTED and transcription_status == TranscriptionStatus.IN_PROGRESS:
+                stale_transcripts.append((video_id, source))
+        
+        # Reset to pending (which also refreshes updated_at) so the next sweep doesn't
+        # send the same work again
+        for rows, values in (
+            (stale_downloads, {"download_status": DownloadStatus.PENDING}),
+            (stale_audio, {"audio_status": AudioStatus.PENDING}),
+            (stale_transcripts, {"transcription_status": TranscriptionStatus.PENDING}),
+        ):
+            if rows:
+                _update_videos(session, [row[0] for row in rows], values)
+    if stale_downloads or stale_audio or stale_transcripts:
+        logger.info(
+            f"Re-dispatching stale work: {len(stale_downloads)} downloads, "
+            f"{len(stale_audio)} audio extractions, {len(stale_transcripts)} transcriptions"
+        )
     
-    session.close()
-    return {"requeued": requeued_count, "restarted": restarted_count}
+    requeued_count = _dispatch(transcribe_audio_task, "transcription", requeue + stale_transcripts)
+    restarted_count = _dispatch(download_video_task, "download", restart + retry + stale_downloads)
+    _dispatch(extract_audio_task, "audio", stale_audio)
+
+    return {
+        "requeued": requeued_count,
+        "restarted": restarted_count,
+        "stale": len(stale_downloads) + len(stale_audio) + len(stale_transcripts),
+    }
 